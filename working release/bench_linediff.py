@@ -0,0 +1,98 @@
+"""Benchmark the difflib and patience line-diff backends on config-sized inputs.
+
+Generates files shaped like the big generated configs modpacks ship (FTB Quests
+chapters, recipe dumps, ore-gen lists), applies a scattered set of edits and
+times both backends. Every diff is applied back onto the old file to check it
+really turns it into the new one.
+
+Usage: python bench_linediff.py [line counts...]   (default: 1000 5000 20000 50000)
+"""
+import random
+import re
+import sys
+import time
+
+from configdiff import DIFF_BACKENDS
+
+
+def quest_chapter(lines, rng):
+    """SNBT-ish quest chapter: lots of near-identical braces and keys"""
+    out = ["{\n", "\tid: \"chapter\"\n", "\tquests: [\n"]
+    quest = 0
+    while len(out) < lines:
+        out += ["\t\t{\n", f"\t\t\tid: \"{quest:016X}\"\n", f"\t\t\tx: {rng.randint(-20, 20)}.0d\n",
+                f"\t\t\ty: {rng.randint(-20, 20)}.0d\n", "\t\t\ttasks: [{\n",
+                f"\t\t\t\titem: \"minecraft:item_{rng.randint(0, 500)}\"\n", "\t\t\t\ttype: \"item\"\n",
+                "\t\t\t}]\n", "\t\t}\n"]
+        quest += 1
+    return out[:lines] + ["\t]\n", "}\n"]
+
+
+def recipe_dump(lines, rng):
+    return [f"recipe_{i} = minecraft:crafting_shaped {{ result: item_{rng.randint(0, 2000)}, count: {rng.randint(1, 64)} }}\n"
+            for i in range(lines)]
+
+
+def ore_list(lines, rng):
+    ores = ["coal", "iron", "gold", "copper", "tin", "lead", "silver", "zinc"]
+    return [f"  \"{rng.choice(ores)}:{rng.randint(0, 320)}:{rng.randint(1, 20)}\",\n" for _ in range(lines)]
+
+
+def edit(lines, rng, edits):
+    new = list(lines)
+    for _ in range(edits):
+        position = rng.randrange(len(new))
+        choice = rng.random()
+        if choice < 0.5:
+            new[position] = new[position].rstrip("\n") + " # changed\n"
+        elif choice < 0.75:
+            del new[position]
+        else:
+            new.insert(position, f"inserted_{rng.randint(0, 10 ** 6)} = true\n")
+    return new
+
+
+def apply_diff(old, diff):
+    """Apply a unified diff produced by one of the backends to old"""
+    result = []
+    position = 0
+    lines = diff.splitlines(True)[2:]
+    for line in lines:
+        if line.startswith("@@"):
+            start = int(re.match(r"@@ -(\d+)", line).group(1))
+            length = re.match(r"@@ -\d+(?:,(\d+))?", line).group(1)
+            # An empty old range is reported one line before where it applies
+            start = start if length == "0" else start - 1
+            result.extend(old[position:start])
+            position = start
+        elif line.startswith(" "):
+            result.append(old[position])
+            position += 1
+        elif line.startswith("-"):
+            position += 1
+        elif line.startswith("+"):
+            result.append(line[1:])
+    result.extend(old[position:])
+    return result
+
+
+def main(sizes):
+    rng = random.Random(42)
+    print(f"{'file':<16}{'lines':>8}{'difflib':>12}{'patience':>12}{'speedup':>10}")
+    for size in sizes:
+        for name, generate in (("quest chapter", quest_chapter), ("recipe dump", recipe_dump), ("ore list", ore_list)):
+            old = generate(size, rng)
+            new = edit(old, rng, max(5, size // 500))
+            timings = {}
+            for backend, diff_func in DIFF_BACKENDS.items():
+                started = time.perf_counter()
+                diff = diff_func(old, new)
+                timings[backend] = time.perf_counter() - started
+                if apply_diff(old, diff) != new:
+                    print(f"{backend} produced a diff that does not apply on {name} ({size} lines)")
+            print(f"{name:<16}{size:>8}{timings['difflib'] * 1000:>10.0f}ms{timings['patience'] * 1000:>10.0f}ms"
+                  f"{timings['difflib'] / max(timings['patience'], 1e-9):>9.1f}x")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [1000, 5000, 20000, 50000])
@@ -0,0 +1,753 @@
+"""Config diffing for the changelog generator: line diffs, key-based diffs and the noise filter.
+
+Kept apart from modpackchangegen.py so config diff worker processes only
+import this module, not tkinter or Selenium.
+"""
+import os
+import io
+import re
+import json
+import zipfile
+import difflib
+import bisect
+import fnmatch
+import collections
+
+def decode_lines(data):
+    """Split raw bytes into lines, decoding as UTF-8 and falling back to latin-1 without re-reading"""
+    try:
+        text = data.decode("utf-8")
+    except UnicodeDecodeError:
+        text = data.decode("latin-1")
+    # newline=None gives the same universal-newline handling as open(..., "r")
+    return io.StringIO(text, newline=None).readlines()
+
+# Above this many lines (old + new) the patience backend replaces difflib
+PATIENCE_DIFF_MIN_LINES = 2000
+# Regions without unique anchor lines bigger than this on either side are reported as replaced
+PATIENCE_FALLBACK_MAX_LINES = 2000
+
+def _unique_anchors(a, b, alo, ahi, blo, bhi):
+    """Longest increasing run of (i, j) over lines that occur exactly once in both ranges"""
+    counts = {}
+    for i in range(alo, ahi):
+        entry = counts.get(a[i])
+        counts[a[i]] = [i, 1, None, 0] if entry is None else [entry[0], entry[1] + 1, None, 0]
+    for j in range(blo, bhi):
+        entry = counts.get(b[j])
+        if entry is not None:
+            entry[2] = j
+            entry[3] += 1
+    pairs = sorted((entry[0], entry[2]) for entry in counts.values() if entry[1] == 1 and entry[3] == 1)
+    # Patience sorting: pile tops hold the smallest j ending an increasing run of each length
+    tops = []
+    top_index = []
+    previous = [None] * len(pairs)
+    for index, (_, j) in enumerate(pairs):
+        pile = bisect.bisect_left(tops, j)
+        if pile > 0:
+            previous[index] = top_index[pile - 1]
+        if pile == len(tops):
+            tops.append(j)
+            top_index.append(index)
+        else:
+            tops[pile] = j
+            top_index[pile] = index
+    anchors = []
+    index = top_index[-1] if top_index else None
+    while index is not None:
+        anchors.append(pairs[index])
+        index = previous[index]
+    anchors.reverse()
+    return anchors
+
+def patience_opcodes(a, b):
+    """SequenceMatcher-style opcodes from a patience diff of two lists of hashable lines.
+    
+    Lines are interned to ints first, common prefixes and suffixes are
+    matched directly, and each remaining region is split on lines unique to
+    both sides. Small regions without such lines go through difflib on the
+    interned ints.
+    """
+    interned = {}
+    a = [interned.setdefault(line, len(interned)) for line in a]
+    b = [interned.setdefault(line, len(interned)) for line in b]
+    matches = []
+    regions = [(0, len(a), 0, len(b))]
+    while regions:
+        alo, ahi, blo, bhi = regions.pop()
+        while alo < ahi and blo < bhi and a[alo] == b[blo]:
+            matches.append((alo, blo))
+            alo += 1
+            blo += 1
+        while alo < ahi and blo < bhi and a[ahi - 1] == b[bhi - 1]:
+            ahi -= 1
+            bhi -= 1
+            matches.append((ahi, bhi))
+        if alo == ahi or blo == bhi:
+            continue
+        anchors = _unique_anchors(a, b, alo, ahi, blo, bhi)
+        if anchors:
+            for i, j in anchors:
+                regions.append((alo, i, blo, j))
+                matches.append((i, j))
+                alo, blo = i + 1, j + 1
+            regions.append((alo, ahi, blo, bhi))
+        elif ahi - alo <= PATIENCE_FALLBACK_MAX_LINES and bhi - blo <= PATIENCE_FALLBACK_MAX_LINES:
+            matcher = difflib.SequenceMatcher(None, a[alo:ahi], b[blo:bhi], autojunk=False)
+            for i, j, size in matcher.get_matching_blocks():
+                matches.extend((alo + i + k, blo + j + k) for k in range(size))
+    matches.sort()
+    
+    opcodes = []
+    i = j = 0
+    for match_i, match_j in matches + [(len(a), len(b))]:
+        if i < match_i or j < match_j:
+            tag = "replace" if i < match_i and j < match_j else "delete" if i < match_i else "insert"
+            opcodes.append((tag, i, match_i, j, match_j))
+        if match_i < len(a):
+            if opcodes and opcodes[-1][0] == "equal":
+                opcodes[-1] = ("equal", opcodes[-1][1], match_i + 1, opcodes[-1][3], match_j + 1)
+            else:
+                opcodes.append(("equal", match_i, match_i + 1, match_j, match_j + 1))
+        i, j = match_i + 1, match_j + 1
+    return opcodes
+
+def _unified_range(start, stop):
+    # Same range notation as difflib.unified_diff
+    length = stop - start
+    if length == 1:
+        return str(start + 1)
+    return f"{start if not length else start + 1},{length}"
+
+def iter_unified_diff(a, b, opcodes, fromfile='old', tofile='new', n=3, offset=0):
+    """Yield difflib.unified_diff lines for precomputed opcodes; offset shifts hunk line numbers"""
+    codes = list(opcodes) or [("equal", 0, 1, 0, 1)]
+    if codes[0][0] == "equal":
+        tag, i1, i2, j1, j2 = codes[0]
+        codes[0] = tag, max(i1, i2 - n), i2, max(j1, j2 - n), j2
+    if codes[-1][0] == "equal":
+        tag, i1, i2, j1, j2 = codes[-1]
+        codes[-1] = tag, i1, min(i2, i1 + n), j1, min(j2, j1 + n)
+    groups = []
+    group = []
+    for tag, i1, i2, j1, j2 in codes:
+        if tag == "equal" and i2 - i1 > n * 2:
+            group.append((tag, i1, min(i2, i1 + n), j1, min(j2, j1 + n)))
+            groups.append(group)
+            group = []
+            i1, j1 = max(i1, i2 - n), max(j1, j2 - n)
+        group.append((tag, i1, i2, j1, j2))
+    if group and not (len(group) == 1 and group[0][0] == "equal"):
+        groups.append(group)
+    
+    for index, group in enumerate(groups):
+        if index == 0:
+            yield f"--- {fromfile}\n"
+            yield f"+++ {tofile}\n"
+        old_range = _unified_range(group[0][1] + offset, group[-1][2] + offset)
+        new_range = _unified_range(group[0][3] + offset, group[-1][4] + offset)
+        yield f"@@ -{old_range} +{new_range} @@\n"
+        for tag, i1, i2, j1, j2 in group:
+            if tag == "equal":
+                yield from (" " + line for line in a[i1:i2])
+                continue
+            if tag in ("replace", "delete"):
+                yield from ("-" + line for line in a[i1:i2])
+            if tag in ("replace", "insert"):
+                yield from ("+" + line for line in b[j1:j2])
+
+def unified_diff_from_opcodes(a, b, opcodes, fromfile='old', tofile='new', n=3):
+    """difflib.unified_diff output for precomputed opcodes, so any backend feeds the same formatter"""
+    return ''.join(iter_unified_diff(a, b, opcodes, fromfile, tofile, n))
+
+def _difflib_diff(old_content, new_content):
+    return ''.join(difflib.unified_diff(old_content, new_content, fromfile='old', tofile='new'))
+
+def _patience_diff(old_content, new_content):
+    return unified_diff_from_opcodes(old_content, new_content, patience_opcodes(old_content, new_content))
+
+DIFF_BACKENDS = {"difflib": _difflib_diff, "patience": _patience_diff}
+
+def compare_contents(old_content, new_content, backend=None):
+    """Unified diff of two line lists; backend is a DIFF_BACKENDS name, picked by size when None"""
+    if backend is None:
+        backend = "patience" if len(old_content) + len(new_content) >= PATIENCE_DIFF_MIN_LINES else "difflib"
+    return DIFF_BACKENDS[backend](old_content, new_content)
+
+# Files at least this big are diffed through streaming_window instead of being read whole
+STREAMING_DIFF_MIN_BYTES = int(os.environ.get("MODPACK_DIFF_STREAM_MIN_MB", 32)) * 1024 * 1024
+# Largest differing middle loaded per side; anything bigger is only summarised
+STREAMING_DIFF_MAX_WINDOW_BYTES = int(os.environ.get("MODPACK_DIFF_MAX_WINDOW_MB", 16)) * 1024 * 1024
+STREAMING_DIFF_CHUNK_BYTES = 1024 * 1024
+
+def _read_exact(stream, size):
+    # Zip members may hand back short reads before EOF
+    parts = []
+    while size > 0:
+        data = stream.read(size)
+        if not data:
+            break
+        parts.append(data)
+        size -= len(data)
+    return b"".join(parts)
+
+def _skip_bytes(stream, count, chunk_size):
+    # Zip members are seekable but seek forward by decompressing 16 MB blocks
+    if stream.seekable() and not isinstance(stream, zipfile.ZipExtFile):
+        stream.seek(count, io.SEEK_CUR)
+        return
+    while count > 0:
+        count -= len(_read_exact(stream, min(count, chunk_size))) or count
+
+def _first_mismatch(a, b):
+    """Index of the first differing byte of two equal-length chunks, or their length"""
+    if a == b:
+        return len(a)
+    lo, hi = 0, len(a)
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        if a[lo:mid] == b[lo:mid]:
+            lo = mid
+        else:
+            hi = mid
+    return lo
+
+def _last_mismatch(a, b):
+    """Index of the last differing byte of two equal-length chunks, or -1"""
+    if a == b:
+        return -1
+    lo, hi = 0, len(a)
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        if a[mid:hi] == b[mid:hi]:
+            hi = mid
+        else:
+            lo = mid
+    return lo
+
+def streaming_window(open_old, old_size, open_new, new_size, max_window_bytes=None, chunk_size=None, context=3):
+    """Locate the differing middle of two large files holding only one chunk per side at a time.
+    
+    open_old/open_new return fresh binary streams. The common prefix is found
+    reading both in lockstep, the common suffix by a second end-aligned pass,
+    and both are trimmed back to whole lines, keeping up to `context` unchanged
+    lines on either side of the changes. Returns a dict with the prefix
+    line count, the window sizes and the decoded window lines, which are None
+    when either window is over max_window_bytes.
+    """
+    max_window_bytes = STREAMING_DIFF_MAX_WINDOW_BYTES if max_window_bytes is None else max_window_bytes
+    chunk_size = chunk_size or STREAMING_DIFF_CHUNK_BYTES
+    shortest = min(old_size, new_size)
+    
+    prefix = prefix_lines = position = 0
+    with open_old() as old_stream, open_new() as new_stream:
+        while position < shortest:
+            old_chunk = _read_exact(old_stream, min(chunk_size, shortest - position))
+            new_chunk = _read_exact(new_stream, len(old_chunk))
+            if not old_chunk or len(new_chunk) != len(old_chunk):
+                break
+            same = _first_mismatch(old_chunk, new_chunk)
+            # The prefix only ever ends on a line break so both windows hold whole lines
+            line_end = old_chunk.rfind(b"\n", 0, same) + 1
+            if same < len(old_chunk):
+                for _ in range(context):
+                    start = old_chunk.rfind(b"\n", 0, max(line_end - 1, 0)) + 1
+                    if not line_end or (not start and position):
+                        break
+                    line_end = start
+            if line_end:
+                prefix = position + line_end
+                prefix_lines += old_chunk.count(b"\n", 0, line_end)
+            if same < len(old_chunk):
+                break
+            position += len(old_chunk)
+    
+    # End-aligned pass over the bytes not already in the prefix; the suffix starts after a
+    # line break following the last mismatch, which is a line start in both files
+    aligned = shortest - prefix
+    suffix = 0
+    if aligned:
+        tail_start = None
+        wanted = context + 1
+        with open_old() as old_stream, open_new() as new_stream:
+            _skip_bytes(old_stream, old_size - aligned, chunk_size)
+            _skip_bytes(new_stream, new_size - aligned, chunk_size)
+            position = 0
+            while position < aligned:
+                old_chunk = _read_exact(old_stream, min(chunk_size, aligned - position))
+                new_chunk = _read_exact(new_stream, len(old_chunk))
+                if not old_chunk or len(new_chunk) != len(old_chunk):
+                    tail_start = None
+                    break
+                differs = _last_mismatch(old_chunk, new_chunk)
+                if differs >= 0:
+                    tail_start = None
+                    wanted = context + 1
+                newline = old_chunk.find(b"\n", differs + 1)
+                while wanted and newline >= 0:
+                    wanted -= 1
+                    tail_start = position + newline + 1
+                    newline = old_chunk.find(b"\n", newline + 1)
+                position += len(old_chunk)
+        if tail_start is not None:
+            suffix = aligned - tail_start
+    
+    old_window = old_size - prefix - suffix
+    new_window = new_size - prefix - suffix
+    window = {"prefix_lines": prefix_lines, "old_window": old_window, "new_window": new_window,
+              "old_lines": None, "new_lines": None}
+    if max(old_window, new_window) > max_window_bytes:
+        return window
+    with open_old() as old_stream, open_new() as new_stream:
+        _skip_bytes(old_stream, prefix, chunk_size)
+        _skip_bytes(new_stream, prefix, chunk_size)
+        window["old_lines"] = decode_lines(_read_exact(old_stream, old_window))
+        window["new_lines"] = decode_lines(_read_exact(new_stream, new_window))
+    return window
+
+def iter_streaming_diff(open_old, old_size, open_new, new_size, max_window_bytes=None):
+    """Lazily yield unified diff lines for two large files, or None if the differing middle is over the cap"""
+    window = streaming_window(open_old, old_size, open_new, new_size, max_window_bytes)
+    old_lines, new_lines = window["old_lines"], window["new_lines"]
+    if old_lines is None:
+        return None
+    if len(old_lines) + len(new_lines) >= PATIENCE_DIFF_MIN_LINES:
+        opcodes = patience_opcodes(old_lines, new_lines)
+    else:
+        opcodes = difflib.SequenceMatcher(None, old_lines, new_lines).get_opcodes()
+    return iter_unified_diff(old_lines, new_lines, opcodes, offset=window["prefix_lines"])
+
+def _flatten_json(value, path, keys):
+    if isinstance(value, dict):
+        for key, child in value.items():
+            _flatten_json(child, f"{path}.{key}" if path else str(key), keys)
+    elif isinstance(value, list) and any(isinstance(child, (dict, list)) for child in value):
+        for index, child in enumerate(value):
+            _flatten_json(child, f"{path}[{index}]", keys)
+    else:
+        keys[path] = json.dumps(value, ensure_ascii=False)
+
+def _add_key(keys, path, value):
+    # A repeated key in the same section must not hide an earlier one
+    if path in keys:
+        count = 2
+        while f"{path} ({count})" in keys:
+            count += 1
+        path = f"{path} ({count})"
+    keys[path] = value
+
+def _bracket_balance(text):
+    """Opening minus closing square brackets, ignoring those inside quoted strings"""
+    balance = 0
+    quote = None
+    escaped = False
+    for char in text:
+        if quote:
+            if escaped:
+                escaped = False
+            elif char == "\\" and quote == '"':
+                escaped = True
+            elif char == quote:
+                quote = None
+        elif char in "\"'":
+            quote = char
+        elif char == "[":
+            balance += 1
+        elif char == "]":
+            balance -= 1
+    return balance
+
+def _parse_key_value_lines(lines, separators):
+    """Flat {key path: value} for line-based configs with [sections], [[tables]] and `name {` blocks"""
+    keys = {}
+    sections = []
+    table_counts = {}
+    # (path, parts, start index, sections, table_counts) while a multi-line [...] value is being collected
+    pending = None
+    single_line = set()  # starts of [ values that never closed, re-read as plain values
+    index = 0
+    while True:
+        if index >= len(lines):
+            if pending is None:
+                break
+            # The list never closed: keep its first line as the value and parse everything after it again
+            path, parts, start, sections, table_counts = pending
+            _add_key(keys, path, parts[0])
+            single_line.add(start)
+            index = start + 1
+            pending = None
+            continue
+        line = lines[index].strip()
+        index += 1
+        if pending:
+            pending[1].append(line)
+            value = " ".join(part for part in pending[1] if part)
+            if _bracket_balance(value) <= 0:
+                _add_key(keys, pending[0], value)
+                pending = None
+            continue
+        if not line or line[0] in "#;!" or line.startswith("//"):
+            continue
+        if line.startswith("[[") and line.endswith("]]"):
+            name = line[2:-2].strip()
+            index = table_counts.get(name, 0)
+            table_counts[name] = index + 1
+            sections = [f"{name}[{index}]"]
+            continue
+        if line.startswith("[") and line.endswith("]"):
+            sections = [line[1:-1].strip()]
+            continue
+        if line.endswith("{") and not any(sep in line for sep in separators):
+            sections.append(line[:-1].strip().strip('"'))
+            continue
+        if line == "}":
+            if sections:
+                sections.pop()
+            continue
+        positions = [line.find(sep) for sep in separators if sep in line]
+        if not positions:
+            continue
+        key = line[:min(positions)].strip()
+        value = line[min(positions) + 1:].strip()
+        if not key:
+            continue
+        path = ".".join(sections + [key])
+        if value.startswith("[") and index - 1 not in single_line and _bracket_balance(value) > 0:
+            pending = (path, [value], index - 1, list(sections), dict(table_counts))
+        else:
+            _add_key(keys, path, value)
+    return keys
+
+def _parse_forge_cfg(lines):
+    """Forge .cfg: `B:name=value` entries, `S:name <` ... `>` lists, inside `category {` blocks"""
+    keys = {}
+    sections = []
+    list_path = None
+    list_items = []
+    for raw_line in lines:
+        line = raw_line.strip()
+        if list_path is not None:
+            if line == ">":
+                _add_key(keys, list_path, "[" + ", ".join(list_items) + "]")
+                list_path = None
+            elif line:
+                list_items.append(line)
+            continue
+        if not line or line.startswith("#"):
+            continue
+        if line.endswith("<") and "=" not in line:
+            list_path = ".".join(sections + [line[:-1].strip()])
+            list_items = []
+        elif line.endswith("{") and "=" not in line:
+            sections.append(line[:-1].strip().strip('"'))
+        elif line == "}":
+            if sections:
+                sections.pop()
+        elif "=" in line:
+            key, value = line.split("=", 1)
+            _add_key(keys, ".".join(sections + [key.strip()]), value.strip())
+    return keys
+
+# File name -> (parser, separator used when showing a key and its value)
+STRUCTURED_CONFIG_FORMATS = [
+    (lambda name: os.path.basename(name).lower() == "options.txt", lambda lines: _parse_key_value_lines(lines, ":"), ":"),
+    (lambda name: name.lower().endswith(".json"), None, " = "),
+    (lambda name: name.lower().endswith(".toml"), lambda lines: _parse_key_value_lines(lines, "="), " = "),
+    (lambda name: name.lower().endswith(".cfg"), _parse_forge_cfg, " = "),
+    (lambda name: name.lower().endswith((".properties", ".ini")), lambda lines: _parse_key_value_lines(lines, "=:"), " = "),
+]
+
+def parse_config_keys(name, lines):
+    """(flat {key path: value}, separator) for a known config format, or None for anything else"""
+    for matches, parser, separator in STRUCTURED_CONFIG_FORMATS:
+        if not matches(name):
+            continue
+        if parser is None:  # JSON
+            try:
+                keys = {}
+                _flatten_json(json.loads("".join(lines)), "", keys)
+                return keys, separator
+            except ValueError:
+                return None
+        return parser(lines), separator
+    return None
+
+_MONTHS = "Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec"
+_TIMEZONES = "CET|UTC|GMT|EST|PST|PDT|EDT"
+
+# Each rule has a name and one of "regex" (searched in the line; use scoped flags like (?i:...)),
+# "key" (a glob matched against the key path or just its last name, ignoring case) or "reordered"
+# (list values that only changed order), optionally limited to files matching a "file" glob.
+# A change is only noise when the two lines are identical once every match is masked out, so a
+# rule never hides a real value change next to it. "reordered" rules need a "file" glob, since
+# the order of many lists (priorities, load orders) matters
+DEFAULT_NOISE_RULES = [
+    {"name": "timestamp comment", "regex": rf"^\s*#.*\b(?:{_TIMEZONES}|{_MONTHS})\b.*"},
+    {"name": "timestamp value", "regex": r"\b\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?(?:Z|[+-]\d{2}:?\d{2})?"},
+    {"name": "last updated", "regex": r"^\s*(?:#|//|;).*(?i:last[ _-]?(?:updated|modified|saved|generated)).*"},
+    {"name": "generated UUID", "regex": r"(?i:\b[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\b)"},
+    {"name": "world seed", "key": "seed"},
+    {"name": "update counter", "key": "lastUpdated"},
+    {"name": "update counter", "key": "timestamp"},
+]
+# Optional JSON list of extra rules in the DEFAULT_NOISE_RULES format
+NOISE_RULES_PATH = os.path.join(os.path.expanduser("~"), ".modpack_changelog_noise.json")
+
+def _key_name(path):
+    """Last name in a key path, without list indexes, duplicate counters, a Forge type prefix or quotes"""
+    name = re.sub(r"(?:\[\d+\]| \(\d+\))+$", "", path.strip()).rsplit(".", 1)[-1]
+    return re.sub(r"^[A-Z]:", "", name.strip("\"'")).strip("\"'")
+
+def _line_key(line):
+    """Key of a `key=value` / `key: value` line, or None"""
+    body = line[2:] if re.match(r"[A-Z]:", line) else line
+    positions = [body.find(sep) for sep in "=:" if sep in body]
+    if not positions:
+        return None
+    return body[:min(positions)].strip() or None
+
+class NoiseFilter:
+    """Drops config churn (timestamps, UUIDs, seeds, reordered lists...) from displayed diffs.
+    
+    All regex and key-glob rules that apply to a file are compiled into one
+    alternation with a named group per rule, so each changed line is scanned
+    in a single pass and lastgroup says which rule matched. Matchers are
+    compiled once per distinct set of applicable rules. Callers pass a hits
+    dict that counts matches per rule name.
+    """
+    def __init__(self, rules):
+        self.rules = list(rules)
+        self._matchers = {}
+    
+    def _matcher(self, name):
+        basename = os.path.basename(name or "")
+        applicable = tuple(index for index, rule in enumerate(self.rules)
+                           if not rule.get("file") or fnmatch.fnmatch(basename.lower(), rule["file"].lower()))
+        matcher = self._matchers.get(applicable)
+        if matcher is None:
+            line_parts = [f"(?P<r{index}>{self.rules[index]['regex']})" for index in applicable
+                          if self.rules[index].get("regex")]
+            key_parts = [f"(?P<r{index}>{fnmatch.translate(self.rules[index]['key'].lower())})" for index in applicable
+                         if self.rules[index].get("key")]
+            matcher = self._matchers[applicable] = (
+                re.compile("|".join(line_parts)) if line_parts else None,
+                re.compile("|".join(key_parts)) if key_parts else None,
+                next((index for index in applicable
+                      if self.rules[index].get("reordered") and self.rules[index].get("file")), None),
+            )
+        return matcher
+    
+    def _hit(self, group, hits):
+        rule_name = self.rules[int(group[1:])]["name"]
+        if hits is not None:
+            hits[rule_name] = hits.get(rule_name, 0) + 1
+        return rule_name
+    
+    def _noise_rule(self, name, key, old_line, new_line, hits):
+        line_regex, key_regex, _ = self._matcher(name)
+        if key and key_regex:
+            match = key_regex.match(key.lower()) or key_regex.match(_key_name(key).lower())
+            if match:
+                return self._hit(match.lastgroup, hits)
+        if line_regex:
+            old_found, new_found = {}, {}
+            
+            def masker(found):
+                def mask(match):
+                    found.setdefault(match.lastgroup, []).append(match.group())
+                    return "\0"
+                return mask
+            
+            if line_regex.sub(masker(old_found), old_line) == line_regex.sub(masker(new_found), new_line):
+                # Credit the rule whose masked text actually changed
+                changed = [group for group in sorted(set(old_found) | set(new_found), key=lambda group: int(group[1:]))
+                           if old_found.get(group) != new_found.get(group)]
+                if changed:
+                    return self._hit(changed[0], hits)
+        return None
+    
+    def match_lines(self, name, old_line, new_line, hits=None):
+        """Name of the rule that makes a changed line noise, or None"""
+        old_key, new_key = _line_key(old_line), _line_key(new_line)
+        return self._noise_rule(name, old_key if old_key == new_key else None, old_line, new_line, hits)
+    
+    def match_change(self, name, key, old_value, new_value, separator, hits=None):
+        """Name of the rule that makes a changed key noise, or None"""
+        rule_name = self._noise_rule(name, key, f"{key}{separator}{old_value}", f"{key}{separator}{new_value}", hits)
+        if rule_name:
+            return rule_name
+        reordered = self._matcher(name)[2]
+        old_items, new_items = _list_items(old_value), _list_items(new_value)
+        if reordered is not None and old_items is not None and new_items is not None and \
+                sorted(old_items) == sorted(new_items):
+            return self._hit(f"r{reordered}", hits)
+        return None
+
+def _list_items(value):
+    """Items of a "[a, b]" list value, or None when it is not a list"""
+    value = value.strip()
+    if not (value.startswith("[") and value.endswith("]")):
+        return None
+    return [item.strip() for item in value[1:-1].split(",") if item.strip()]
+
+_noise_filter = None
+
+def _noise_rule_error(rule):
+    """Why a noise rule from NOISE_RULES_PATH can't be used, or None if it is valid"""
+    if not isinstance(rule, dict):
+        return "not an object"
+    if not isinstance(rule.get("name"), str) or not rule["name"]:
+        return 'missing "name"'
+    kinds = [kind for kind in ("regex", "key", "reordered") if rule.get(kind)]
+    if len(kinds) != 1:
+        return 'needs exactly one of "regex", "key" or "reordered"'
+    if "file" in rule and not isinstance(rule["file"], str):
+        return '"file" must be a glob string'
+    if kinds[0] == "reordered" and not rule.get("file"):
+        return '"reordered" needs a "file" glob'
+    if kinds[0] in ("regex", "key") and not isinstance(rule[kinds[0]], str):
+        return f'"{kinds[0]}" must be a string'
+    if kinds[0] == "regex":
+        # Compiled the way _matcher wraps it, so it can't break the shared alternation later
+        try:
+            compiled = re.compile(f"(?P<r0>{rule['regex']})")
+        except re.error as e:
+            return f"invalid regex: {e}"
+        if any(re.fullmatch(r"r\d+", group) for group in compiled.groupindex if group != "r0") or \
+                re.search(r"\\\d|\(\?P=", rule["regex"]):
+            return "regex may not use r<number> group names or backreferences"
+    return None
+
+def get_noise_filter():
+    """NoiseFilter built from DEFAULT_NOISE_RULES plus NOISE_RULES_PATH, once per process"""
+    global _noise_filter
+    if _noise_filter is None:
+        rules = list(DEFAULT_NOISE_RULES)
+        if os.path.exists(NOISE_RULES_PATH):
+            try:
+                with open(NOISE_RULES_PATH, 'r', encoding='utf-8') as f:
+                    extra_rules = json.load(f)
+                if not isinstance(extra_rules, list):
+                    raise ValueError("expected a JSON list of rules")
+                for index, rule in enumerate(extra_rules):
+                    error = _noise_rule_error(rule)
+                    if error:
+                        print(f"Skipping noise rule {index} in {NOISE_RULES_PATH}: {error}")
+                    else:
+                        rules.append(rule)
+            except (OSError, ValueError) as e:
+                print(f"Error loading noise rules: {e}")
+        _noise_filter = NoiseFilter(rules)
+    return _noise_filter
+
+def structured_config_diff(name, old_lines, new_lines, noise_hits=None):
+    """Changed keys of a known config format as "Changed:"/"Changed to:" lines, or None to fall back to a line diff.
+    
+    Both files are parsed into flat key-path -> value maps and joined on the
+    key, so shifted lines never mis-pair a change. Like format_diff_for_display,
+    keys that were only added or only removed are left out, and so are
+    changes the noise filter matches. Returns "" when every change was noise,
+    and None when the parsed maps are the same (or one is empty) but the text
+    differs, so a change the parser cannot see still reaches the line diff.
+    """
+    old_parsed = parse_config_keys(name, old_lines)
+    new_parsed = parse_config_keys(name, new_lines)
+    if old_parsed is None or new_parsed is None:
+        return None
+    old_keys, separator = old_parsed
+    new_keys = new_parsed[0]
+    noise = get_noise_filter()
+    formatted_lines = []
+    noise_matched = False
+    for path, new_value in new_keys.items():
+        old_value = old_keys.get(path)
+        if old_value is not None and old_value != new_value:
+            if noise.match_change(name, path, old_value, new_value, separator, noise_hits):
+                noise_matched = True
+                continue
+            formatted_lines.append(f"Changed: {path}{separator}{old_value}")
+            formatted_lines.append(f"Changed to: {path}{separator}{new_value}")
+    if not formatted_lines and not noise_matched and old_lines != new_lines:
+        if old_keys == new_keys or not old_keys or not new_keys:
+            return None
+    return '\n'.join(formatted_lines)
+
+def display_diff(name, old_lines, new_lines, noise_hits=None):
+    """Changes between two versions of a config for the changelog: key-based when the format is known"""
+    structured = structured_config_diff(name, old_lines, new_lines, noise_hits)
+    if structured is not None:
+        return structured
+    diff = compare_contents(old_lines, new_lines)
+    return format_diff_for_display(diff, name, noise_hits) if diff.strip() else ""
+
+def _diff_config_task(task):
+    """Process pool worker: diff one changed config from its raw bytes; returns (name, diff, noise hits)"""
+    name, old_data, new_data, format_diffs = task
+    old_content = decode_lines(old_data) if old_data is not None else []
+    new_content = decode_lines(new_data) if new_data is not None else []
+    noise_hits = {}
+    if format_diffs:
+        return name, display_diff(name, old_content, new_content, noise_hits), noise_hits
+    return name, compare_contents(old_content, new_content), noise_hits
+
+def iter_formatted_diff(diff, name=None, noise_hits=None):
+    """Yield the "Changed:"/"Changed to:" lines of format_diff_for_display as the diff is read.
+    
+    Removed and added lines are paired in order, so only lines still waiting
+    for a partner are held and a streamed diff is never joined into one string.
+    """
+    removed_lines = collections.deque()
+    added_lines = collections.deque()
+    noise = get_noise_filter()
+    # Streamed diffs arrive as an iterator of lines
+    lines = diff.splitlines() if isinstance(diff, str) else (line.rstrip("\r\n") for line in diff)
+    
+    for line in lines:
+        if line.startswith('---') or line.startswith('+++') or line.startswith('@@') or line.startswith(' '):
+            continue
+        
+        if line.startswith('-'):
+            removed_lines.append(line[1:])
+        elif line.startswith('+'):
+            added_lines.append(line[1:])
+        
+        # Only include pairs of lines that are similar (actual changes)
+        while removed_lines and added_lines:
+            removed = removed_lines.popleft()
+            added = added_lines.popleft()
+            
+            # Are these lines similar? (likely a change rather than insert/delete)
+            # Dissimilar pairs are skipped, which leaves out pure additions/removals as requested
+            if similarity_score(removed, added) <= 0.5:  # Threshold for considering it a change
+                continue
+            # Skip timestamps, UUIDs and other churn the noise rules match
+            if noise.match_lines(name, removed.strip(), added.strip(), noise_hits):
+                continue
+            yield f"Changed: {removed}"
+            yield f"Changed to: {added}"
+    
+    # Don't include any remaining lines since they're pure additions/removals
+
+def format_diff_for_display(diff, name=None, noise_hits=None):
+    """Format diff output to only show changes to existing lines, hiding additions/removals"""
+    return '\n'.join(iter_formatted_diff(diff, name, noise_hits))
+
+# Helper function to assess similarity between two strings
+def similarity_score(str1, str2):
+    """Calculate a similarity score between 0 and 1"""
+    # Simple implementation - can be improved
+    if '=' in str1 and '=' in str2:
+        # For config lines with key=value format, compare the keys
+        key1 = str1.split('=')[0].strip()
+        key2 = str2.split('=')[0].strip()
+        return 1.0 if key1 == key2 else 0.0
+    
+    # For other formats, use string similarity
+    try:
+        import difflib
+        return difflib.SequenceMatcher(None, str1, str2).ratio()
+    except:
+        # Fallback if difflib not available
+        common = set(str1) & set(str2)
+        return len(common) / max(len(set(str1)), len(set(str2)))
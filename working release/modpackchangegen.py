@@ -1,12 +1,19 @@
 import os
 import zipfile
-import tempfile
+import zlib
+import io
 import json
 import tkinter as tk
 from tkinter import filedialog, messagebox, scrolledtext
 import threading
+import multiprocessing
+import abc
+import queue
 import time
 import requests
+import requests.adapters
+import random
+from urllib.parse import urlparse
 from bs4 import BeautifulSoup
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
@@ -14,19 +21,68 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import SessionNotCreatedException, WebDriverException
 from webdriver_manager.chrome import ChromeDriverManager
-from functools import lru_cache
-from concurrent.futures import ThreadPoolExecutor
-import difflib
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, Future
 from tkinter import ttk
 import pickle
+import sqlite3
 import os.path
 import re
 import markdown
+from configdiff import (decode_lines, compare_contents, display_diff, format_diff_for_display, iter_streaming_diff,
+                        _diff_config_task, STREAMING_DIFF_MIN_BYTES, STREAMING_DIFF_MAX_WINDOW_BYTES)
+try:
+    import tomllib
+except ImportError:  # Python < 3.11, mods.toml falls back to a regex scan
+    tomllib = None
+
+# Resolved chromedriver path, remembered so later runs skip ChromeDriverManager entirely
+DRIVER_PATH_CACHE = os.path.join(os.path.expanduser("~"), ".modpack_changelog_driver.json")
+_driver_path = None
+_driver_path_lock = threading.Lock()
+
+def chrome_driver_path(refresh=False):
+    """Path to chromedriver, asking ChromeDriverManager only when no cached path still exists"""
+    global _driver_path
+    with _driver_path_lock:
+        if not refresh:
+            if _driver_path and os.path.exists(_driver_path):
+                return _driver_path
+            try:
+                with open(DRIVER_PATH_CACHE, 'r') as f:
+                    cached = json.load(f).get("path")
+                if cached and os.path.exists(cached):
+                    _driver_path = cached
+                    return _driver_path
+            except (OSError, ValueError):
+                pass
+        _driver_path = ChromeDriverManager().install()
+        try:
+            with open(DRIVER_PATH_CACHE, 'w') as f:
+                json.dump({"path": _driver_path}, f)
+        except OSError as e:
+            print(f"Could not save driver path: {e}")
+        return _driver_path
+
+# "lean" blocks everything but the page's own HTML and scripts; "full" loads pages as a user would
+SCRAPE_PROFILE = os.environ.get("MODPACK_SCRAPE_PROFILE", "lean")
+# URL patterns blocked through CDP in the lean profile: images, fonts, media and ads/analytics
+LEAN_BLOCKED_URLS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*.mp4", "*.webm", "*.mp3", "*.ogg",
+    "*googletagmanager.com*", "*google-analytics.com*", "*doubleclick.net*", "*googlesyndication.com*",
+    "*adservice.google.com*", "*amazon-adsystem.com*", "*facebook.net*", "*hotjar.com*",
+    "*quantserve.com*", "*scorecardresearch.com*", "*pubmatic.com*", "*adnxs.com*",
+]
 
 class PersistentChromeBrowser:
-    def __init__(self):
+    def __init__(self, profile=None):
         self.driver = None
+        self.profile = profile or SCRAPE_PROFILE
+        # Seconds from navigation to file name for every page this browser loaded
+        self.page_times = []
     
     def get_driver(self):
         if self.driver is None:
@@ -41,30 +97,371 @@ class PersistentChromeBrowser:
             options.add_experimental_option("excludeSwitches", ["enable-automation"])
             options.add_experimental_option('useAutomationExtension', False)
             options.add_argument(f"user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36")
+            if self.profile == "lean":
+                # Hand the page back at DOMContentLoaded; the file name is waited for explicitly
+                options.page_load_strategy = "eager"
+                options.add_argument("--blink-settings=imagesEnabled=false")
             
-            service = Service(ChromeDriverManager().install())
-            self.driver = webdriver.Chrome(service=service, options=options)
+            try:
+                self.driver = webdriver.Chrome(service=Service(chrome_driver_path()), options=options)
+            except SessionNotCreatedException:
+                # Chrome was updated past the cached driver, so resolve a matching one
+                self.driver = webdriver.Chrome(service=Service(chrome_driver_path(refresh=True)), options=options)
             
             # Execute CDP commands to prevent detection
             self.driver.execute_cdp_cmd('Network.setUserAgentOverride', {
                 "userAgent": 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36'
             })
             self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+            if self.profile == "lean":
+                self.driver.execute_cdp_cmd('Network.enable', {})
+                self.driver.execute_cdp_cmd('Network.setBlockedURLs', {"urls": LEAN_BLOCKED_URLS})
         return self.driver
     
+    def is_alive(self):
+        """False once a started driver has crashed or its window was closed"""
+        if self.driver is None:
+            return True
+        try:
+            self.driver.current_url
+            return True
+        except WebDriverException:
+            return False
+    
     def close(self):
         if self.driver:
             self.driver.quit()
             self.driver = None
 
-def extract_file_from_zip(zip_path, filename):
-    temp_dir = tempfile.mkdtemp()
-    with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-        for file in zip_ref.namelist():
-            if file.endswith(filename):
-                zip_ref.extract(file, temp_dir)
-                return os.path.join(temp_dir, file)
-    return None
+class BrowserPool:
+    """Fixed-size pool of headless browsers that work through a shared queue of jobs"""
+    def __init__(self, size):
+        self.size = max(1, size)
+        self._browsers = [PersistentChromeBrowser() for _ in range(self.size)]
+        self._idle = queue.Queue()
+        for browser in self._browsers:
+            self._idle.put(browser)
+    
+    def map(self, func, jobs, on_done=None):
+        """Run func(browser, job) for every job on up to `size` browsers at once.
+        
+        Results come back in job order whatever order they finish in. on_done is
+        called with the number of finished jobs and the job itself after each
+        one completes.
+        """
+        done_count = 0
+        done_lock = threading.Lock()
+        
+        def run(job):
+            nonlocal done_count
+            browser = self._idle.get()
+            try:
+                return func(browser, job)
+            finally:
+                self._idle.put(browser)
+                with done_lock:
+                    done_count += 1
+                    finished = done_count
+                if on_done:
+                    on_done(finished, job)
+        
+        with ThreadPoolExecutor(max_workers=self.size) as executor:
+            return list(executor.map(run, jobs))
+    
+    def is_alive(self):
+        return all(browser.is_alive() for browser in self._browsers)
+    
+    def page_times(self):
+        return [elapsed for browser in self._browsers for elapsed in browser.page_times]
+    
+    def close(self):
+        for browser in self._browsers:
+            try:
+                browser.close()
+            except Exception as e:
+                print(f"Error closing browser: {e}")
+
+# Browsers started when looking up updated mod versions
+DEFAULT_BROWSER_POOL_SIZE = 3
+# Seconds a warm browser pool may sit unused before it is shut down
+BROWSER_IDLE_TIMEOUT = 600
+
+class BrowserService:
+    """Keeps a BrowserPool warm between changelog runs and shuts it down when idle.
+    
+    acquire() hands out the running pool (starting or resizing it when
+    needed) and release() starts the idle timer instead of quitting Chrome,
+    so regenerating a changelog skips the browser cold start.
+    """
+    def __init__(self, idle_timeout=BROWSER_IDLE_TIMEOUT):
+        self.idle_timeout = idle_timeout
+        self._pool = None
+        self._users = 0
+        self._timer = None
+        self._lock = threading.Lock()
+    
+    def acquire(self, size=DEFAULT_BROWSER_POOL_SIZE):
+        with self._lock:
+            self._cancel_timer()
+            if self._pool is not None and (self._pool.size != max(1, size) or not self._pool.is_alive()):
+                if self._users == 0:
+                    self._pool.close()
+                    self._pool = None
+            if self._pool is None:
+                self._pool = BrowserPool(size)
+            self._users += 1
+            return self._pool
+    
+    def release(self):
+        with self._lock:
+            self._users = max(0, self._users - 1)
+            if self._users == 0 and self._pool is not None:
+                self._timer = threading.Timer(self.idle_timeout, self._shutdown_idle)
+                self._timer.daemon = True
+                self._timer.start()
+    
+    def _cancel_timer(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+    
+    def _shutdown_idle(self):
+        with self._lock:
+            if self._users == 0 and self._pool is not None:
+                self._pool.close()
+                self._pool = None
+            self._timer = None
+    
+    def close(self):
+        with self._lock:
+            self._cancel_timer()
+            if self._pool is not None:
+                self._pool.close()
+                self._pool = None
+
+class ModpackSource(abc.ABC):
+    """Indexed view over the members of a modpack, with a folder prefix index built once.
+    
+    Member names always use the export layout ("manifest.json",
+    "overrides/config/...") whatever the underlying storage is.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.members = {}
+        self.by_prefix = {}
+        self._manifest_data = None
+        self._modrinth_index = None
+    
+    def _add_member(self, name, info):
+        self.members[name] = info
+        parts = name.split('/')
+        for depth in range(1, len(parts)):
+            self.by_prefix.setdefault('/'.join(parts[:depth]) + '/', []).append(name)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def find(self, filename):
+        """Return the member at filename relative to the pack root, or None"""
+        return filename if filename in self.members else None
+    
+    def files_under(self, folder):
+        """Return all members inside folder (which must end with '/')"""
+        return list(self.by_prefix.get(folder, []))
+    
+    @abc.abstractmethod
+    def size(self, name):
+        """Uncompressed size of a member in bytes"""
+    
+    def mtime(self, name):
+        """Modification time in ns, or None when the storage has no reliable one"""
+        return None
+    
+    @abc.abstractmethod
+    def crc(self, name):
+        """CRC-32 of a member's contents"""
+    
+    @abc.abstractmethod
+    def open(self, name):
+        """Binary file object for a member"""
+    
+    def read_bytes(self, name):
+        with self.open(name) as f:
+            return f.read()
+    
+    def read_lines(self, name):
+        return decode_lines(self.read_bytes(name))
+    
+    def read_text(self, name):
+        return ''.join(self.read_lines(name))
+    
+    def manifest_data(self):
+        """Parsed manifest.json, loaded once per modpack"""
+        if self._manifest_data is None:
+            name = self.find("manifest.json")
+            self._manifest_data = json.loads(self.read_bytes(name)) if name else {}
+        return self._manifest_data
+    
+    def modrinth_index(self):
+        """Parsed modrinth.index.json for .mrpack files, or None"""
+        if self._modrinth_index is None:
+            name = self.find("modrinth.index.json")
+            self._modrinth_index = json.loads(self.read_bytes(name)) if name else {}
+        return self._modrinth_index or None
+    
+    def modlist(self):
+        name = self.find("modlist.html")
+        return self.read_text(name) if name else None
+    
+    def options(self):
+        return self.find("overrides/options.txt")
+    
+    def configs(self):
+        return self.files_under("overrides/config/")
+    
+    def datapacks(self):
+        return self.files_under("overrides/config/paxi/datapacks/")
+    
+    def custom_jars(self):
+        return [name for name in self.files_under("overrides/mods/") if name.lower().endswith('.jar')]
+    
+    def close(self):
+        pass
+
+class ModpackArchive(ModpackSource):
+    """Single open handle on a modpack ZIP; member contents are streamed from ZipFile.open()"""
+    def __init__(self, zip_path):
+        super().__init__(zip_path)
+        self.zip_ref = zipfile.ZipFile(zip_path, 'r')
+        self._wrapper = None
+        
+        # Read the central directory once
+        for info in self.zip_ref.infolist():
+            if not info.is_dir():
+                self._add_member(info.filename, info)
+    
+    def size(self, name):
+        return self.members[name].file_size
+    
+    def crc(self, name):
+        # Stored in the central directory, so this never touches member data
+        return self.members[name].CRC
+    
+    def find(self, filename):
+        """Like ModpackSource.find, but also looks inside a single folder wrapping the whole ZIP"""
+        found = super().find(filename)
+        if found is None and self._wrapper is None:
+            top_levels = {name.split('/', 1)[0] for name in self.members}
+            wrapped = (len(top_levels) == 1 and all('/' in name for name in self.members) and
+                       top_levels != {"overrides"})
+            self._wrapper = f"{top_levels.pop()}/" if wrapped else ""
+        if found is None and self._wrapper:
+            candidate = self._wrapper + filename
+            found = candidate if candidate in self.members else None
+        return found
+    
+    def open(self, name):
+        return self.zip_ref.open(name)
+    
+    def close(self):
+        if self.zip_ref:
+            self.zip_ref.close()
+            self.zip_ref = None
+
+class ModpackDirectory(ModpackSource):
+    """Unpacked modpack: either an extracted export or a live game instance folder.
+    
+    An export (manifest.json or overrides/ at the root) is indexed as-is. An
+    instance folder only has its config/ and mods/ trees and root files walked,
+    and they are presented under "overrides/" so both layouts compare alike.
+    """
+    INSTANCE_FOLDERS = ("config", "mods")
+    
+    def __init__(self, dir_path):
+        super().__init__(dir_path)
+        self._crcs = {}
+        self._managed_jars = set()
+        is_export = (os.path.isfile(os.path.join(dir_path, "manifest.json")) or
+                     os.path.isdir(os.path.join(dir_path, "overrides")))
+        if is_export:
+            self._scan(dir_path, "", recursive=True)
+        else:
+            self._scan(dir_path, "overrides/", recursive=False)
+            for folder in self.INSTANCE_FOLDERS:
+                folder_path = os.path.join(dir_path, folder)
+                if os.path.isdir(folder_path):
+                    self._scan(folder_path, f"overrides/{folder}/", recursive=True)
+    
+    def _scan(self, dir_path, prefix, recursive):
+        # scandir hands back stat data with the directory listing, so size and
+        # mtime are known for every file without opening any of them
+        with os.scandir(dir_path) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if recursive:
+                        self._scan(entry.path, f"{prefix}{entry.name}/", recursive)
+                elif entry.is_file():
+                    stat = entry.stat()
+                    self._add_member(prefix + entry.name, (entry.path, stat.st_size, stat.st_mtime_ns))
+    
+    def size(self, name):
+        return self.members[name][1]
+    
+    def mtime(self, name):
+        return self.members[name][2]
+    
+    def crc(self, name):
+        if name not in self._crcs:
+            crc = 0
+            with self.open(name) as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                    crc = zlib.crc32(chunk, crc)
+            self._crcs[name] = crc
+        return self._crcs[name]
+    
+    def open(self, name):
+        return open(self.members[name][0], "rb")
+    
+    def manifest_data(self):
+        """manifest.json, or one rebuilt from the CurseForge app's minecraftinstance.json"""
+        if self._manifest_data is None:
+            super().manifest_data()
+            instance_name = self.find("overrides/minecraftinstance.json")
+            if not self._manifest_data and instance_name:
+                instance = json.loads(self.read_bytes(instance_name))
+                self._manifest_data = {
+                    "minecraft": {"version": instance.get("gameVersion", "")},
+                    "files": [{"projectID": addon["addonID"], "fileID": addon["installedFile"]["id"]}
+                              for addon in instance.get("installedAddons", []) if addon.get("installedFile")],
+                }
+                self._managed_jars = {addon["installedFile"].get("fileName")
+                                      for addon in instance.get("installedAddons", []) if addon.get("installedFile")}
+        return self._manifest_data
+    
+    def custom_jars(self):
+        # In an instance folder, mods/ also holds every CurseForge-managed jar
+        self.manifest_data()
+        return [name for name in super().custom_jars() if os.path.basename(name) not in self._managed_jars]
+
+def open_modpack(path):
+    """Open a modpack ZIP or unpacked directory"""
+    if os.path.isdir(path):
+        return ModpackDirectory(path)
+    return ModpackArchive(path)
+
+def same_member(old_pack, old_name, new_pack, new_name):
+    """True if two members hold identical bytes, using the cheapest evidence available"""
+    if old_pack.size(old_name) != new_pack.size(new_name):
+        return False
+    # Equal size and mtime is trusted for folders, like rsync's quick check
+    old_mtime = old_pack.mtime(old_name)
+    if old_mtime is not None and old_mtime == new_pack.mtime(new_name):
+        return True
+    # Free for ZIP members; folder files are only hashed when the quick check fails
+    return old_pack.crc(old_name) == new_pack.crc(new_name)
 
 def setup_selenium():
     options = Options()
@@ -76,38 +473,475 @@ def setup_selenium():
     options.add_argument("--enable-unsafe-swiftshader")
     options.add_argument("--disable-gpu")
     options.add_argument("--disable-software-rasterizer")
-    return webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
+    return webdriver.Chrome(service=Service(chrome_driver_path()), options=options)
+
+class MetadataCache:
+    """Persistent SQLite cache for CurseForge project metadata and file names.
+    
+    Project names and URLs can change on CurseForge, so they expire after
+    project_ttl seconds. A (project_id, file_id) -> file name mapping never
+    changes and is kept until evicted. Each table is capped at max_entries
+    rows, evicting the least recently used ones first.
+    
+    Failed lookups are remembered in a separate table for negative_ttl
+    seconds, so a project that keeps failing is not retried on every run.
+    A later successful put clears the failure.
+    """
+    EVICT_EVERY = 100
+    
+    def __init__(self, db_path, project_ttl=7 * 24 * 3600, max_entries=20000, negative_ttl=3600):
+        self.db_path = db_path
+        self.project_ttl = project_ttl
+        self.max_entries = max_entries
+        self.negative_ttl = negative_ttl
+        self._lock = threading.Lock()
+        self._writes = 0
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        with self._lock, self.conn:
+            self.conn.execute("""CREATE TABLE IF NOT EXISTS projects (
+                project_id TEXT PRIMARY KEY, name TEXT, url TEXT,
+                fetched_at REAL, accessed_at REAL)""")
+            self.conn.execute("""CREATE TABLE IF NOT EXISTS files (
+                project_id TEXT, file_id TEXT, filename TEXT,
+                fetched_at REAL, accessed_at REAL,
+                PRIMARY KEY (project_id, file_id))""")
+            self.conn.execute("""CREATE TABLE IF NOT EXISTS failures (
+                kind TEXT, key TEXT, result TEXT, failed_at REAL,
+                PRIMARY KEY (kind, key))""")
+        self._evict()
+    
+    def get_project_entry(self, project_id):
+        """(name, url, fetched_at) if cached at all, however old, else None"""
+        with self._lock, self.conn:
+            row = self.conn.execute("SELECT name, url, fetched_at FROM projects WHERE project_id = ?",
+                                    (str(project_id),)).fetchone()
+            if row is None:
+                return None
+            self.conn.execute("UPDATE projects SET accessed_at = ? WHERE project_id = ?",
+                              (time.time(), str(project_id)))
+        return row
+    
+    def get_project(self, project_id, max_age=None):
+        """(name, url) if cached and not older than max_age (default project_ttl), else None"""
+        max_age = self.project_ttl if max_age is None else max_age
+        entry = self.get_project_entry(project_id)
+        if entry is None or time.time() - entry[2] > max_age:
+            return None
+        return entry[0], entry[1]
+    
+    def put_project(self, project_id, name, url):
+        now = time.time()
+        with self._lock, self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO projects VALUES (?, ?, ?, ?, ?)",
+                              (str(project_id), name, url, now, now))
+            self.conn.execute("DELETE FROM failures WHERE kind = 'project' AND key = ?", (str(project_id),))
+        self._count_write()
+    
+    def get_file(self, project_id, file_id):
+        with self._lock, self.conn:
+            row = self.conn.execute("SELECT filename FROM files WHERE project_id = ? AND file_id = ?",
+                                    (str(project_id), str(file_id))).fetchone()
+            if row is None:
+                return None
+            self.conn.execute("UPDATE files SET accessed_at = ? WHERE project_id = ? AND file_id = ?",
+                              (time.time(), str(project_id), str(file_id)))
+        return row[0]
+    
+    def put_file(self, project_id, file_id, filename):
+        now = time.time()
+        with self._lock, self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?)",
+                              (str(project_id), str(file_id), filename, now, now))
+            self.conn.execute("DELETE FROM failures WHERE kind = 'file' AND key = ?", (f"{project_id}/{file_id}",))
+        self._count_write()
+    
+    def get_failure(self, kind, key):
+        """Placeholder result of a lookup that failed less than negative_ttl seconds ago, else None"""
+        with self._lock, self.conn:
+            row = self.conn.execute("SELECT result, failed_at FROM failures WHERE kind = ? AND key = ?",
+                                    (kind, str(key))).fetchone()
+        if row is None or time.time() - row[1] > self.negative_ttl:
+            return None
+        return row[0]
+    
+    def put_failure(self, kind, key, result):
+        with self._lock, self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO failures VALUES (?, ?, ?, ?)",
+                              (kind, str(key), result, time.time()))
+        self._count_write()
+    
+    def _count_write(self):
+        self._writes += 1
+        if self._writes % self.EVICT_EVERY == 0:
+            self._evict()
+    
+    def _evict(self):
+        with self._lock, self.conn:
+            for table in ("projects", "files"):
+                self.conn.execute(f"""DELETE FROM {table} WHERE rowid IN (
+                    SELECT rowid FROM {table} ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)""",
+                                  (self.max_entries,))
+            self.conn.execute("DELETE FROM failures WHERE failed_at < ?", (time.time() - self.negative_ttl,))
+    
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+class TokenBucket:
+    """Allows `rate` acquisitions per second on average, with bursts up to `capacity`"""
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.last = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        # Waiters queue up on the lock, so tokens are handed out in arrival order
+        with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.last) * self.rate)
+                self.last = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                time.sleep((1 - self.tokens) / self.rate)
+
+# Signs of a bot challenge, which only a real browser can get past
+CHALLENGE_MARKERS = ("challenge-platform", "cf-chl", "Just a moment...", "cf-browser-verification")
+
+def is_bot_challenge(response):
+    """True for a Cloudflare challenge page, whatever status it was served with"""
+    if response.headers.get("cf-mitigated", "").lower() == "challenge":
+        return True
+    return any(marker in response.text for marker in CHALLENGE_MARKERS)
+
+class HttpClient:
+    """Shared keep-alive HTTP session with per-host concurrency and rate limits.
+    
+    Responses with a status in RETRY_STATUSES, plus connection errors and
+    timeouts, are retried with exponential backoff and jitter, honouring
+    Retry-After when the server sends it. Bot challenges are returned at once,
+    since retrying them never helps, and max_retries can be overridden per
+    call. stats() reports request, retry and latency counters.
+    """
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+    
+    def __init__(self, max_per_host=6, rate_per_host=5.0, burst=10, max_retries=4, backoff=0.5, timeout=10):
+        self.max_per_host = max_per_host
+        self.rate_per_host = rate_per_host
+        self.burst = burst
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=8, pool_maxsize=max_per_host * 2)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._hosts = {}
+        self._lock = threading.Lock()
+        self._stats = {"requests": 0, "retries": 0, "failures": 0, "latency_total": 0.0, "latency_max": 0.0}
+    
+    def _host_limits(self, url):
+        host = urlparse(url).netloc
+        with self._lock:
+            if host not in self._hosts:
+                self._hosts[host] = (threading.BoundedSemaphore(self.max_per_host),
+                                     TokenBucket(self.rate_per_host, self.burst))
+            return self._hosts[host]
+    
+    def _record(self, key, value=1):
+        with self._lock:
+            self._stats[key] += value
+    
+    def request(self, method, url, max_retries=None, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        max_retries = self.max_retries if max_retries is None else max_retries
+        semaphore, bucket = self._host_limits(url)
+        for attempt in range(max_retries + 1):
+            bucket.acquire()
+            retry_after = None
+            start = time.monotonic()
+            try:
+                with semaphore:
+                    response = self.session.request(method, url, **kwargs)
+                if response.status_code not in self.RETRY_STATUSES or is_bot_challenge(response):
+                    return response
+                retry_after = response.headers.get("Retry-After")
+                error = requests.HTTPError(f"{response.status_code} for {url}", response=response)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = e
+            finally:
+                latency = time.monotonic() - start
+                with self._lock:
+                    self._stats["requests"] += 1
+                    self._stats["latency_total"] += latency
+                    self._stats["latency_max"] = max(self._stats["latency_max"], latency)
+            
+            if attempt == max_retries:
+                break
+            self._record("retries")
+            delay = self.backoff * (2 ** attempt) * (1 + random.random())
+            if retry_after and retry_after.isdigit():
+                delay = max(delay, int(retry_after))
+            time.sleep(delay)
+        self._record("failures")
+        raise error
+    
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+    
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+    
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        stats["latency_avg"] = stats["latency_total"] / stats["requests"] if stats["requests"] else 0.0
+        return stats
+
+_http_client = None
+_http_client_lock = threading.Lock()
+
+def get_http_client():
+    """Shared HttpClient, created on first use"""
+    global _http_client
+    with _http_client_lock:
+        if _http_client is None:
+            _http_client = HttpClient()
+        return _http_client
+
+def format_http_stats(stats):
+    return (f"HTTP: {stats['requests']} requests, {stats['retries']} retries, {stats['failures']} failures, "
+            f"avg {stats['latency_avg'] * 1000:.0f} ms, max {stats['latency_max'] * 1000:.0f} ms")
+
+METADATA_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".modpack_changelog_cache.sqlite")
+# Seconds a failed lookup is remembered before it is tried again
+NEGATIVE_CACHE_TTL = int(os.environ.get("MODPACK_NEGATIVE_CACHE_TTL", 3600))
+_metadata_cache = None
+_metadata_cache_lock = threading.Lock()
+
+def get_metadata_cache():
+    """Shared MetadataCache, opened on first use"""
+    global _metadata_cache
+    with _metadata_cache_lock:
+        if _metadata_cache is None:
+            _metadata_cache = MetadataCache(METADATA_CACHE_PATH, negative_ttl=NEGATIVE_CACHE_TTL)
+        return _metadata_cache
+
+# Placeholder results from fetch_mod_version; these go to the negative cache, never the files table
+FAILED_VERSIONS = ("File not found!", "Unknown Version", "")
+
+class SingleFlight:
+    """Coalesces concurrent calls for the same key into one in-flight call.
+    
+    The first caller for a key runs the function; callers arriving while it
+    is still running wait for it and share its result (or its exception).
+    stats() counts calls, calls that actually ran and calls that were
+    coalesced onto another one.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights = {}
+        self.counters = {"calls": 0, "executed": 0, "coalesced": 0}
+    
+    def do(self, key, func):
+        with self._lock:
+            self.counters["calls"] += 1
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = {"done": threading.Event(), "result": None, "error": None}
+                self.counters["executed"] += 1
+            else:
+                self.counters["coalesced"] += 1
+        if not leader:
+            flight["done"].wait()
+            if flight["error"] is not None:
+                raise flight["error"]
+            return flight["result"]
+        try:
+            flight["result"] = func()
+            return flight["result"]
+        except BaseException as e:
+            flight["error"] = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight["done"].set()
+    
+    def stats(self):
+        with self._lock:
+            return dict(self.counters)
+
+# Shared by every lookup so concurrent generations never fetch the same key twice at once
+LOOKUP_FLIGHTS = SingleFlight()
+
+def format_flight_stats(stats):
+    return f"Single-flight: {stats['calls']} lookups, {stats['executed']} fetched, {stats['coalesced']} coalesced"
+
+_revalidation_pool = None
+_revalidating = set()
+_revalidation_lock = threading.Lock()
+
+def revalidate_in_background(key, refresh):
+    """Run refresh() on a background thread unless a refresh for key is already running"""
+    global _revalidation_pool
+    with _revalidation_lock:
+        if key in _revalidating:
+            return
+        _revalidating.add(key)
+        if _revalidation_pool is None:
+            _revalidation_pool = ThreadPoolExecutor(max_workers=2)
+    
+    def run():
+        try:
+            refresh()
+        except Exception as e:
+            print(f"Background refresh of {key} failed: {e}")
+        finally:
+            with _revalidation_lock:
+                _revalidating.discard(key)
+    
+    _revalidation_pool.submit(run)
+
+def cached_project_info(project_id, refresh, stale_ids=None):
+    """(name, url) from the cache, stale or not, or from a recent failure; None on a miss.
+    
+    A stale entry is returned straight away and refresh(project_id) runs in
+    the background to update it for the next run. With a stale_ids list the
+    ID is appended to it instead, for callers that refresh in batches.
+    """
+    cache = get_metadata_cache()
+    entry = cache.get_project_entry(project_id)
+    if entry:
+        if time.time() - entry[2] > cache.project_ttl:
+            if stale_ids is not None:
+                stale_ids.append(project_id)
+            else:
+                revalidate_in_background(("project", project_id), lambda: refresh(project_id))
+        return entry[0], entry[1]
+    failure = cache.get_failure("project", project_id)
+    if failure is not None:
+        return failure, None
+    return None
+
+def cached_file_name(project_id, file_id):
+    """Cached file name, or the placeholder of a recent failure; None on a miss"""
+    cache = get_metadata_cache()
+    filename = cache.get_file(project_id, file_id)
+    if filename is None:
+        filename = cache.get_failure("file", f"{project_id}/{file_id}")
+    return filename
 
-@lru_cache(maxsize=100)
 def fetch_mod_info_from_cflookup(project_id):
+    cached = cached_project_info(project_id, _refresh_mod_info_from_cflookup)
+    if cached:
+        return cached
+    return _refresh_mod_info_from_cflookup(project_id)
+
+def _refresh_mod_info_from_cflookup(project_id):
+    def lookup():
+        cache = get_metadata_cache()
+        mod_name, mod_url = _lookup_mod_info_from_cflookup(project_id)
+        if mod_url:
+            cache.put_project(project_id, mod_name, mod_url)
+        elif cache.get_project_entry(project_id) is None:
+            # Keep serving a stale entry rather than replacing it with a failure
+            cache.put_failure("project", project_id, mod_name)
+        return mod_name, mod_url
+    
+    return LOOKUP_FLIGHTS.do(("project", str(project_id)), lookup)
+
+def _lookup_mod_info_from_cflookup(project_id):
     lookup_url = f"https://cflookup.com/{project_id}"
     try:
-        response = requests.get(lookup_url, timeout=10)
+        response = get_http_client().get(lookup_url)
         response.raise_for_status()
         soup = BeautifulSoup(response.text, "html.parser")
-        mod_name_tag = soup.find("h2").find("a", class_="text-white")
+        heading = soup.find("h2")
+        mod_name_tag = heading.find("a", class_="text-white") if heading else None
         mod_name = mod_name_tag.text.strip() if mod_name_tag else f"Mod {project_id}"
         mod_url = mod_name_tag['href'] if mod_name_tag else None
+        if not mod_name_tag:
+            print(f"cflookup: no mod link found for {project_id}")
         return mod_name, mod_url
     except requests.RequestException as e:
-        print(f"Request Error: {e}")
+        print(f"Request Error for {project_id} after retries: {e}")
         return f"Mod {project_id}", None
 
-def fetch_mod_version(mod_url, file_id, browser):
+def fetch_mod_version(mod_url, file_id, browser, project_id=None, tiers=None):
+    """File name for a CurseForge file page, from the cache, a plain GET or the browser.
+    
+    The tier that served the lookup ("cache", "http" or "browser") is
+    recorded in tiers[(project_id or mod_url, file_id)] when given.
+    Concurrent calls for the same file share one fetch.
+    """
+    # A file ID always points at the same file, so a cached name never goes stale
+    cache_key = project_id or mod_url
+    cache = get_metadata_cache()
+    filename = cached_file_name(cache_key, file_id)
+    tier = "cache"
+    if filename is None:
+        def fetch():
+            filename = _fetch_mod_version_http(mod_url, file_id)
+            tier = "http"
+            if filename is None:
+                filename = _scrape_mod_version(mod_url, file_id, browser)
+                tier = "browser"
+            if filename not in FAILED_VERSIONS:
+                cache.put_file(cache_key, file_id, filename)
+            else:
+                cache.put_failure("file", f"{cache_key}/{file_id}", filename)
+            return filename, tier
+        
+        filename, tier = LOOKUP_FLIGHTS.do(("file", str(cache_key), str(file_id)), fetch)
+    if tiers is not None:
+        tiers[(cache_key, file_id)] = tier
+    return filename
+
+# Selectors tried in order for the file name on a CurseForge file page
+FILE_NAME_SELECTORS = ("section.section-file-info h2", ".file-name span", "h3.font-bold")
+BROWSER_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36"
+
+def _fetch_mod_version_http(mod_url, file_id):
+    """File name from the server-rendered page, or None when the browser is needed"""
+    version_url = f"{mod_url}/files/{file_id}"
+    try:
+        # A single probe: any failure falls straight through to the browser instead of backing off
+        response = get_http_client().get(version_url, max_retries=0, headers={"User-Agent": BROWSER_USER_AGENT})
+    except requests.RequestException as e:
+        print(f"HTTP fetch failed for {version_url}, using browser: {e}")
+        return None
+    if response.status_code != 200 or is_bot_challenge(response):
+        return None
+    soup = BeautifulSoup(response.text, "html.parser")
+    for selector in FILE_NAME_SELECTORS:
+        element = soup.select_one(selector)
+        if element and element.get_text(strip=True):
+            return element.get_text(strip=True)
+    return None
+
+def _scrape_mod_version(mod_url, file_id, browser):
     try:
         driver = browser.get_driver()
         version_url = f"{mod_url}/files/{file_id}"
         print(f"Fetching: {version_url}")
+        started = time.perf_counter()
         driver.get(version_url)
         
         # Wait more dynamically instead of fixed sleep
         try:
-            # First try to wait for the right element
+            # Return as soon as any of the file name elements shows up
             WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "section.section-file-info h2"))
+                EC.presence_of_element_located((By.CSS_SELECTOR, ", ".join(FILE_NAME_SELECTORS)))
             )
-            filename_element = driver.find_element(By.CSS_SELECTOR, "section.section-file-info h2")
-            filename = filename_element.text.strip()
+            filename = ""
+            elements = driver.find_elements(By.CSS_SELECTOR, "section.section-file-info h2")
+            if elements:
+                filename = elements[0].text.strip()
             
             # If we got an empty string, try alternative selectors
             if not filename:
@@ -130,73 +964,597 @@ def fetch_mod_version(mod_url, file_id, browser):
             driver.save_screenshot(f"debug_{file_id}.png")
             filename = "File not found!"
         
+        elapsed = time.perf_counter() - started
+        browser.page_times.append(elapsed)
+        print(f"Loaded {version_url} in {elapsed * 1000:.0f} ms ({browser.profile} profile)")
         return filename
     except Exception as e:
         print(f"Error fetching file name: {e}")
         return "Unknown Version"
 
-def extract_mods_from_manifest(manifest_path):
-    if not os.path.exists(manifest_path):
-        return {}
-    with open(manifest_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-        return {str(mod["projectID"]): str(mod["fileID"]) for mod in data.get("files", [])}
-
-def extract_mods_from_modlist(modlist_path):
-    if not os.path.exists(modlist_path):
-        return set()
-    with open(modlist_path, "r", encoding="utf-8") as f:
-        soup = BeautifulSoup(f, "html.parser")
-        mods = set()
-        for mod in soup.find_all("li"):
-            mod_name = mod.text.strip()
-            mods.add(mod_name)
-        return mods
-
-def parse_modlist_html(modlist_path):
-    if not os.path.exists(modlist_path):
-        return {}
-    with open(modlist_path, "r", encoding="utf-8") as f:
-        soup = BeautifulSoup(f, "html.parser")
-        mod_links = {}
-        for mod in soup.find_all("li"):
-            mod_name = mod.text.strip()
-            mod_url = mod.find("a")["href"]
-            mod_links[mod_name] = mod_url
-        return mod_links
-
-def read_file_content(file_path):
+class ModResolver(abc.ABC):
+    """Looks up mod names/URLs for CurseForge project IDs and file names for file IDs.
+    
+    `lookups` counts the project and file lookups that actually had to go to
+    the network (cache hits are not counted).
+    """
+    def __init__(self):
+        self.lookups = {"projects": 0, "files": 0}
+        self._lookups_lock = threading.Lock()
+        self._mod_infos = {}
+        # {(project_id, file_id): tier} for every file name resolved
+        self.tiers = {}
+    
+    def add_known_projects(self, mod_infos):
+        """Seed names/URLs already known from local data so they are never looked up"""
+        self._mod_infos.update(mod_infos)
+    
+    def mod_name(self, project_id):
+        """Name resolved for a project so far, for progress messages"""
+        return (self._mod_infos.get(project_id) or (f"Mod {project_id}",))[0]
+    
+    def _count_lookups(self, kind, count=1):
+        with self._lookups_lock:
+            self.lookups[kind] += count
+    
+    @abc.abstractmethod
+    def resolve_projects(self, project_ids):
+        """Return {project_id: (mod_name, mod_url)}"""
+    
+    @abc.abstractmethod
+    def resolve_files(self, files, on_progress=None, should_stop=None):
+        """Return {(project_id, file_id): file_name} for a list of (project_id, file_id) pairs.
+        
+        on_progress(done, total, project_id) is called as lookups finish, and
+        should_stop() lets a caller abandon the remaining ones.
+        """
+    
+    def close(self):
+        pass
+
+class ScrapingResolver(ModResolver):
+    """cflookup.com for project names plus headless-browser scraping of file pages.
+    
+    With a browser_service the browsers are borrowed from it and stay warm
+    after close(); otherwise the resolver owns a pool and quits it.
+    """
+    def __init__(self, browser_pool_size=DEFAULT_BROWSER_POOL_SIZE, browser_service=None):
+        super().__init__()
+        self.browser_pool_size = browser_pool_size
+        self.browser_service = browser_service
+        self._pool = None
+    
+    def _fetch_project(self, project_id):
+        cached = cached_project_info(project_id, _refresh_mod_info_from_cflookup)
+        if cached:
+            return cached
+        self._count_lookups("projects")
+        return _refresh_mod_info_from_cflookup(project_id)
+    
+    def resolve_projects(self, project_ids):
+        with ThreadPoolExecutor() as executor:
+            futures = {project_id: executor.submit(self._fetch_project, project_id)
+                       for project_id in project_ids if project_id not in self._mod_infos}
+        self._mod_infos.update({project_id: future.result() for project_id, future in futures.items()})
+        return {project_id: self._mod_infos[project_id] for project_id in project_ids}
+    
+    def resolve_files(self, files, on_progress=None, should_stop=None):
+        # Reuses names/URLs from an earlier resolve_projects call
+        mod_infos = self.resolve_projects({project_id for project_id, _ in files})
+        if self._pool is None:
+            if self.browser_service:
+                self._pool = self.browser_service.acquire(self.browser_pool_size)
+            else:
+                self._pool = BrowserPool(self.browser_pool_size)
+        
+        def fetch(browser, file_key):
+            project_id, file_id = file_key
+            if should_stop and should_stop():
+                return "Unknown Version"
+            cached = cached_file_name(project_id, file_id)
+            if cached is not None:
+                self.tiers[file_key] = "cache"
+                return cached
+            self._count_lookups("files")
+            return fetch_mod_version(mod_infos[project_id][1], file_id, browser, project_id, self.tiers)
+        
+        def on_done(done_count, file_key):
+            if on_progress:
+                on_progress(done_count, len(files), file_key[0])
+        
+        loaded_before = len(self._pool.page_times())
+        versions = dict(zip(files, self._pool.map(fetch, files, on_done)))
+        page_times = self._pool.page_times()[loaded_before:]
+        if page_times:
+            print(f"Browser pages: {len(page_times)} loaded, avg {sum(page_times) / len(page_times) * 1000:.0f} ms, "
+                  f"max {max(page_times) * 1000:.0f} ms ({SCRAPE_PROFILE} profile)")
+        return versions
+    
+    def close(self):
+        if self._pool:
+            if self.browser_service:
+                self.browser_service.release()
+            else:
+                self._pool.close()
+            self._pool = None
+
+class CurseForgeApiResolver(ModResolver):
+    """CurseForge Core API backend that resolves every ID in batched requests.
+    
+    All project IDs go out in one POST /v1/mods call and all file IDs in one
+    POST /v1/mods/files call (split only past BATCH_SIZE IDs). base_url can
+    point at a local stub server for testing.
+    """
+    BATCH_SIZE = 1000
+    
+    def __init__(self, api_key, base_url="https://api.curseforge.com", timeout=30):
+        super().__init__()
+        self.api_key = api_key
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+    
+    def _post(self, path, body):
+        response = get_http_client().post(f"{self.base_url}{path}", json=body, timeout=self.timeout,
+                                          headers={"x-api-key": self.api_key, "Accept": "application/json"})
+        response.raise_for_status()
+        return response.json().get("data", [])
+    
+    def _batched(self, path, key, ids):
+        results = []
+        ids = sorted(ids, key=int)
+        for start in range(0, len(ids), self.BATCH_SIZE):
+            results.extend(self._post(path, {key: [int(i) for i in ids[start:start + self.BATCH_SIZE]]}))
+        return results
+    
+    def _fetch_projects(self, project_ids):
+        """Look up projects in one batch and cache the results; IDs the API does not know are negatively cached"""
+        cache = get_metadata_cache()
+        mod_infos = {}
+        try:
+            for mod in self._batched("/v1/mods", "modIds", project_ids):
+                project_id = str(mod["id"])
+                mod_url = (mod.get("links") or {}).get("websiteUrl")
+                mod_infos[project_id] = (mod.get("name") or f"Mod {project_id}", mod_url)
+                if mod_url:
+                    cache.put_project(project_id, mod_infos[project_id][0], mod_url)
+        except (requests.RequestException, ValueError) as e:
+            print(f"CurseForge API error (mods): {e}")
+            return mod_infos
+        for project_id in project_ids:
+            if not (mod_infos.get(project_id) or (None, None))[1] and cache.get_project_entry(project_id) is None:
+                cache.put_failure("project", project_id, f"Mod {project_id}")
+        return mod_infos
+    
+    def resolve_projects(self, project_ids):
+        mod_infos = {}
+        missing = []
+        stale = []
+        for project_id in project_ids:
+            cached = self._mod_infos.get(project_id) or cached_project_info(project_id, None, stale)
+            if cached:
+                mod_infos[project_id] = cached
+            else:
+                missing.append(project_id)
+        if stale:
+            # Every stale entry is refreshed by one batched request, not one request per project
+            revalidate_in_background(("projects", tuple(sorted(stale, key=int))), lambda: self._fetch_projects(stale))
+        if missing:
+            self._count_lookups("projects", len(missing))
+            mod_infos.update(self._fetch_projects(missing))
+        for project_id in project_ids:
+            mod_infos.setdefault(project_id, (f"Mod {project_id}", None))
+        self._mod_infos.update(mod_infos)
+        return mod_infos
+    
+    def resolve_files(self, files, on_progress=None, should_stop=None):
+        cache = get_metadata_cache()
+        versions = {}
+        missing = {}
+        for project_id, file_id in files:
+            cached = cached_file_name(project_id, file_id)
+            if cached is not None:
+                versions[(project_id, file_id)] = cached
+                self.tiers[(project_id, file_id)] = "cache"
+            else:
+                missing[str(file_id)] = project_id
+        if missing and not (should_stop and should_stop()):
+            self._count_lookups("files", len(missing))
+            try:
+                for file_info in self._batched("/v1/mods/files", "fileIds", missing):
+                    file_id = str(file_info["id"])
+                    project_id = missing.get(file_id, str(file_info.get("modId")))
+                    filename = file_info.get("displayName") or file_info.get("fileName")
+                    if filename:
+                        versions[(project_id, file_id)] = filename
+                        self.tiers[(project_id, file_id)] = "api"
+                        cache.put_file(project_id, file_id, filename)
+                for file_id, project_id in missing.items():
+                    if (project_id, file_id) not in versions:
+                        cache.put_failure("file", f"{project_id}/{file_id}", "File not found!")
+                        versions[(project_id, file_id)] = "File not found!"
+            except (requests.RequestException, ValueError) as e:
+                print(f"CurseForge API error (files): {e}")
+        for done_count, file_key in enumerate(files, 1):
+            versions.setdefault(file_key, "Unknown Version")
+            # The whole batch lands at once, but the GUI still names each mod as it is filled in
+            if on_progress:
+                on_progress(done_count, len(files), file_key[0])
+        return versions
+
+class ResolutionPlan:
+    """Minimum set of remote lookups needed for the enabled changelog sections.
+    
+    The manifest delta is computed first; only mods whose fileID changed need
+    a name/URL and two file names. Added and removed mods are named from
+    modlist.html, so they never need a lookup, and neither do updated mods
+    passed in known_projects (see ModIdentityIndex).
+    """
+    def __init__(self, old_mods, new_mods, known_projects=None):
+        self.total_mods = len(new_mods)
+        self.updated = [(project_id, old_mods[project_id], new_file_id)
+                        for project_id, new_file_id in new_mods.items()
+                        if old_mods.get(project_id) and old_mods[project_id] != new_file_id]
+        updated_ids = {project_id for project_id, _, _ in self.updated}
+        self.known_projects = {project_id: info for project_id, info in (known_projects or {}).items()
+                               if project_id in updated_ids}
+        self.project_ids = [project_id for project_id, _, _ in self.updated if project_id not in self.known_projects]
+        self.files = [(project_id, file_id) for project_id, old_file_id, new_file_id in self.updated
+                      for file_id in (old_file_id, new_file_id)]
+        self.executed = {"projects": 0, "files": 0}
+        self.tiers = {}
+    
+    def execute(self, resolver, on_progress=None, should_stop=None):
+        """Run the planned lookups; returns {project_id: (name, url)} and {(project_id, file_id): file name}"""
+        resolver.add_known_projects(self.known_projects)
+        mod_infos = dict(self.known_projects)
+        mod_infos.update(resolver.resolve_projects(self.project_ids))
+        versions = resolver.resolve_files(self.files, on_progress, should_stop) if self.files else {}
+        self.executed = dict(resolver.lookups)
+        self.tiers = dict(resolver.tiers)
+        return mod_infos, versions
+    
+    def summary(self):
+        served = {}
+        for tier in self.tiers.values():
+            served[tier] = served.get(tier, 0) + 1
+        served_text = ", ".join(f"{count} {tier}" for tier, count in sorted(served.items())) or "none"
+        return (f"Lookups: {len(self.project_ids)} names planned ({len(self.known_projects)} known offline), "
+                f"{self.executed['projects']} fetched; "
+                f"{len(self.files)} versions planned, {self.executed['files']} fetched "
+                f"({self.total_mods - len(self.updated)} unchanged mods skipped); "
+                f"versions served by: {served_text}")
+
+def create_resolver(api_key=None, browser_pool_size=DEFAULT_BROWSER_POOL_SIZE, browser_service=None):
+    """Batch API resolver when a CurseForge API key is available, scraping otherwise"""
+    api_key = api_key or os.environ.get("CURSEFORGE_API_KEY")
+    if api_key:
+        return CurseForgeApiResolver(api_key, os.environ.get("CURSEFORGE_API_URL", "https://api.curseforge.com"))
+    return ScrapingResolver(browser_pool_size, browser_service)
+
+def resolve_updated_mods(plan, resolver, on_progress=None, should_stop=None):
+    """Remote stage: run the plan and return {mod_name: {"version", "url"}}, closing the resolver.
+    
+    Meant to run on its own thread while the local archive analysis goes
+    on; the two only meet when the changelog is rendered.
+    """
+    started = time.perf_counter()
+    updated_mods = {}
     try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            return f.readlines()
-    except UnicodeDecodeError:
-        with open(file_path, "r", encoding="latin-1") as f:
-            return f.readlines()
-
-def compare_files(old_file, new_file):
-    old_content = read_file_content(old_file) if old_file else []
-    new_content = read_file_content(new_file) if new_file else []
-    diff = difflib.unified_diff(old_content, new_content, fromfile='old', tofile='new')
-    return ''.join(diff)
-
-def extract_and_compare_configs(old_zip, new_zip):
-    old_configs = extract_files_from_zip(old_zip, "overrides/config/")
-    new_configs = extract_files_from_zip(new_zip, "overrides/config/")
-    config_changes = {}
-    for config in set(old_configs.keys()).union(new_configs.keys()):
+        mod_infos, versions = plan.execute(resolver, on_progress, should_stop)
+        for project_id, old_file_id, new_file_id in plan.updated:
+            mod_name, mod_url = mod_infos[project_id]
+            updated_mods[mod_name] = {
+                "version": f"{versions[(project_id, old_file_id)]} → {versions[(project_id, new_file_id)]}",
+                "url": mod_url
+            }
+    finally:
+        resolver.close()
+        print(f"{plan.summary()} in {time.perf_counter() - started:.2f} s")
+        print(format_http_stats(get_http_client().stats()))
+        print(format_flight_stats(LOOKUP_FLIGHTS.stats()))
+    return updated_mods
+
+def extract_mods_from_manifest(manifest_data):
+    return {str(mod["projectID"]): str(mod["fileID"]) for mod in manifest_data.get("files", [])}
+
+MODRINTH_CDN_PATTERN = re.compile(r'/data/([^/]+)/versions/([^/]+)/')
+
+def mod_name_from_filename(filename):
+    """Best-effort mod name from a jar file name ("create-1.20.1-0.5.1.jar" -> "create")"""
+    base = os.path.splitext(filename)[0]
+    match = re.match(r'(.+?)[-_ +]+v?\d', base)
+    return match.group(1) if match else base
+
+def extract_mods_from_modrinth_index(index_data):
+    """Map each mod in modrinth.index.json to its file name, hash and project link"""
+    mods = {}
+    for entry in index_data.get("files", []):
+        path = entry.get("path", "")
+        if not path.startswith("mods/"):
+            continue
+        filename = os.path.basename(path)
+        project_id = None
+        for url in entry.get("downloads", []):
+            match = MODRINTH_CDN_PATTERN.search(url)
+            if match:
+                project_id = match.group(1)
+                break
+        name = mod_name_from_filename(filename)
+        hashes = entry.get("hashes", {})
+        # Key by Modrinth project ID so a renamed jar is still the same mod
+        mods[project_id or name.lower()] = {
+            "name": name,
+            "version": os.path.splitext(filename)[0],
+            "hash": hashes.get("sha512") or hashes.get("sha1"),
+            "url": f"https://modrinth.com/mod/{project_id}" if project_id else None,
+        }
+    return mods
+
+def compare_modrinth_mods(old_index, new_index):
+    """Added, removed and updated mods between two .mrpack indexes, without any network calls"""
+    old_mods = extract_mods_from_modrinth_index(old_index)
+    new_mods = extract_mods_from_modrinth_index(new_index)
+    added = {new_mods[key]["name"]: new_mods[key]["url"] for key in new_mods.keys() - old_mods.keys()}
+    removed = {old_mods[key]["name"]: old_mods[key]["url"] for key in old_mods.keys() - new_mods.keys()}
+    updated = {}
+    for key in sorted(old_mods.keys() & new_mods.keys()):
+        old_mod, new_mod = old_mods[key], new_mods[key]
+        if old_mod["hash"] != new_mod["hash"]:
+            updated[new_mod["name"]] = {
+                "version": f"{old_mod['version']} → {new_mod['version']}",
+                "url": new_mod["url"]
+            }
+    return added, removed, updated
+
+def mod_slug(mod_url):
+    """Last path segment of a CurseForge project URL, which survives mod renames"""
+    if not mod_url:
+        return None
+    return mod_url.rstrip('/').rsplit('/', 1)[-1].lower()
+
+def parse_modlist_html(modlist_html):
+    """{slug: (mod_name, mod_url)} for every entry in modlist.html"""
+    soup = BeautifulSoup(modlist_html, "html.parser")
+    entries = {}
+    for mod in soup.find_all("li"):
+        mod_name = mod.text.strip()
+        link = mod.find("a")
+        mod_url = link["href"] if link and link.has_attr("href") else None
+        entries[mod_slug(mod_url) or mod_name.lower()] = (mod_name, mod_url)
+    return entries
+
+class ModIdentityIndex:
+    """Joins manifest projectIDs to modlist.html entries and classifies every mod in one pass.
+    
+    A projectID is matched to a modlist entry through the CurseForge slug in
+    a previously cached project URL. If exactly one added (or removed)
+    projectID and one added (or removed) modlist entry are still unmatched,
+    they are paired as well. Modlist entries are keyed by slug, so a mod
+    renamed on CurseForge stays one unchanged mod instead of a removed+added
+    pair. Each entry of `mods` has project_id, slug, name, url, old_file_id,
+    new_file_id and status ("added", "removed", "updated" or "unchanged").
+    """
+    def __init__(self, old_mods, new_mods, old_modlist_html, new_modlist_html, cache=None):
+        old_entries = parse_modlist_html(old_modlist_html) if old_modlist_html else {}
+        new_entries = parse_modlist_html(new_modlist_html) if new_modlist_html else {}
+        project_ids = list(new_mods) + [project_id for project_id in old_mods if project_id not in new_mods]
+        
+        # Slugs rarely change, so any cached URL is good enough for matching
+        slug_by_project = {}
+        if cache:
+            for project_id in project_ids:
+                cached = cache.get_project(project_id, max_age=float("inf"))
+                slug = mod_slug(cached[1]) if cached else None
+                if slug in old_entries or slug in new_entries:
+                    slug_by_project[project_id] = slug
+        
+        matched_slugs = set(slug_by_project.values())
+        for in_new in (True, False):
+            loose_projects = [project_id for project_id in project_ids if project_id not in slug_by_project and
+                              (project_id in new_mods) == in_new and (project_id in old_mods) != in_new]
+            loose_slugs = [slug for slug in (new_entries if in_new else old_entries)
+                           if slug not in matched_slugs and slug not in (old_entries if in_new else new_entries)]
+            if len(loose_projects) == 1 and len(loose_slugs) == 1:
+                slug_by_project[loose_projects[0]] = loose_slugs[0]
+                matched_slugs.add(loose_slugs[0])
+        
+        self.mods = []
+        for project_id in project_ids:
+            old_file_id, new_file_id = old_mods.get(project_id), new_mods.get(project_id)
+            if old_file_id is None:
+                status = "added"
+            elif new_file_id is None:
+                status = "removed"
+            else:
+                status = "updated" if old_file_id != new_file_id else "unchanged"
+            slug = slug_by_project.get(project_id)
+            self._add(project_id, slug, new_entries.get(slug) or old_entries.get(slug),
+                      old_file_id, new_file_id, status)
+        
+        for slug in sorted((old_entries.keys() | new_entries.keys()) - matched_slugs):
+            if slug not in old_entries:
+                status = "added"
+            elif slug not in new_entries:
+                status = "removed"
+            else:
+                status = "unchanged"
+            self._add(None, slug, new_entries.get(slug) or old_entries.get(slug), None, None, status)
+    
+    def _add(self, project_id, slug, entry, old_file_id, new_file_id, status):
+        self.mods.append({
+            "project_id": project_id, "slug": slug,
+            "name": entry[0] if entry else None, "url": entry[1] if entry else None,
+            "old_file_id": old_file_id, "new_file_id": new_file_id, "status": status,
+        })
+    
+    def links(self, status):
+        """{mod_name: mod_url} for named mods with the given status"""
+        return {mod["name"]: mod["url"] for mod in self.mods if mod["status"] == status and mod["name"]}
+    
+    def known_projects(self):
+        """{project_id: (mod_name, mod_url)} for every projectID matched to a modlist entry"""
+        return {mod["project_id"]: (mod["name"], mod["url"]) for mod in self.mods
+                if mod["project_id"] and mod["name"] and mod["url"]}
+
+def compare_members(old_pack, old_name, new_pack, new_name):
+    """Diff two archive members without writing either to disk"""
+    old_content = old_pack.read_lines(old_name) if old_name else []
+    new_content = new_pack.read_lines(new_name) if new_name else []
+    return compare_contents(old_content, new_content)
+
+# Each diff worker gets at least this many changed files...
+PARALLEL_DIFF_MIN_FILES = 32
+# ...and the pool only starts once this many bytes of changed configs are waiting
+PARALLEL_DIFF_MIN_BYTES = 8 * 1024 * 1024
+
+def _run_diff_tasks(tasks, workers):
+    """Run diff tasks across a process pool, falling back to this process; results keep task order.
+    
+    Every worker starts a fresh interpreter, so the pool is only used when the
+    changed files are big enough in total to pay for that, and never with
+    more workers than CPUs or than PARALLEL_DIFF_MIN_FILES-sized shares.
+    """
+    total_bytes = sum(len(data) for task in tasks for data in task[1:3] if data is not None)
+    workers = min(workers or 1, os.cpu_count() or 1, len(tasks) // PARALLEL_DIFF_MIN_FILES)
+    if workers > 1 and total_bytes >= PARALLEL_DIFF_MIN_BYTES:
+        try:
+            # Spawned, not forked: lookup and browser threads may be holding locks (even the
+            # stdout lock) at this point, and a forked child would inherit them held
+            with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+                # map() yields in submission order, so output stays deterministic
+                return list(executor.map(_diff_config_task, tasks, chunksize=max(1, len(tasks) // (workers * 4))))
+        except Exception as e:
+            print(f"Parallel config diff failed, falling back to a single process: {e}")
+    return [_diff_config_task(task) for task in tasks]
+
+def _sniff_member(pack, name):
+    with pack.open(name) as stream:
+        return stream.read(BINARY_SNIFF_BYTES)
+
+def _streaming_config_diff(config, old_pack, old_name, new_pack, new_name, format_diffs):
+    """Diff one oversized config in this process without reading it whole; returns (name, diff, noise hits)"""
+    old_size, new_size = old_pack.size(old_name), new_pack.size(new_name)
+    diff_lines = iter_streaming_diff(lambda: old_pack.open(old_name), old_size, lambda: new_pack.open(new_name), new_size,
+                                     STREAMING_DIFF_MAX_WINDOW_BYTES)
+    if diff_lines is None:
+        return config, (f"file too large to diff ({format_size(old_size)} → {format_size(new_size)}, changes span "
+                        f"more than {format_size(STREAMING_DIFF_MAX_WINDOW_BYTES)})"), {}
+    noise_hits = {}
+    if format_diffs:
+        return config, format_diff_for_display(diff_lines, config, noise_hits), noise_hits
+    return config, ''.join(diff_lines), noise_hits
+
+# Never decoded as text, whatever their contents
+BINARY_EXTENSIONS = {
+    ".png", ".jpg", ".jpeg", ".gif", ".bmp", ".ico", ".ogg", ".wav", ".mp3",
+    ".nbt", ".dat", ".dat_old", ".mca", ".schematic", ".schem", ".litematic",
+    ".zip", ".jar", ".gz", ".class", ".bin", ".ttf", ".otf", ".db", ".sqlite",
+}
+# Always treated as text, so they are diffed without sniffing
+TEXT_EXTENSIONS = {
+    ".txt", ".cfg", ".toml", ".json", ".json5", ".properties", ".ini", ".yml", ".yaml",
+    ".snbt", ".js", ".zs", ".xml", ".csv", ".conf", ".mcmeta", ".md", ".lang",
+}
+# Bytes checked for a NUL when the extension says nothing
+BINARY_SNIFF_BYTES = 8192
+
+def binary_by_extension(name):
+    """True or False when the extension decides, None when the content has to be sniffed"""
+    extension = os.path.splitext(name)[1].lower()
+    if extension in BINARY_EXTENSIONS:
+        return True
+    if extension in TEXT_EXTENSIONS:
+        return False
+    return None
+
+def looks_binary(data):
+    return b"\0" in data[:BINARY_SNIFF_BYTES]
+
+def format_size(size):
+    for unit in ("B", "KB", "MB"):
+        if size < 1024 or unit == "MB":
+            return f"{size} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+def extract_and_compare_configs(old_pack, new_pack, stats=None, workers=1, format_diffs=False):
+    """Diff config members, skipping files that same_member() shows are unchanged.
+    
+    Changed files are diffed on up to `workers` processes (1 keeps everything in
+    this process). With format_diffs=True the returned values are already
+    formatted by display_diff. Binary files (by extension, or a NUL byte in
+    the first block) are never decoded; a changed one is reported as
+    "binary file changed (old size → new size)". Files of STREAMING_DIFF_MIN_BYTES
+    or more are diffed here through streaming_window, line by line rather than
+    by key path, and only when present in both packs. If a stats dict is given
+    it is filled with "total", "skipped", "diffed", "binary" and "streamed" counts.
+    """
+    old_configs = set(old_pack.configs())
+    new_configs = set(new_pack.configs())
+    tasks = []
+    results = []
+    total = skipped = binary = streamed = 0
+    for config in sorted(old_configs.union(new_configs)):
         if "datapacks" not in config:  # Exclude datapacks folder
-            old_file = old_configs.get(config)
-            new_file = new_configs.get(config)
-            diff = compare_files(old_file, new_file)
-            if diff:
-                config_changes[os.path.basename(config)] = diff
+            total += 1
+            old_name = config if config in old_configs else None
+            new_name = config if config in new_configs else None
+            # Identical fingerprints mean identical bytes, so there is nothing to decompress
+            if old_name and new_name and same_member(old_pack, old_name, new_pack, new_name):
+                skipped += 1
+                continue
+            is_binary = binary_by_extension(config)
+            streaming = max(old_pack.size(old_name) if old_name else 0,
+                            new_pack.size(new_name) if new_name else 0) >= STREAMING_DIFF_MIN_BYTES
+            old_data = new_data = None
+            if is_binary is not True and streaming:
+                is_binary = any(looks_binary(_sniff_member(pack, name))
+                                for pack, name in ((old_pack, old_name), (new_pack, new_name)) if name)
+            elif is_binary is not True:
+                old_data = old_pack.read_bytes(old_name) if old_name else None
+                new_data = new_pack.read_bytes(new_name) if new_name else None
+                is_binary = any(data is not None and looks_binary(data) for data in (old_data, new_data))
+            if is_binary:
+                binary += 1
+                # Like text configs, only files present in both packs count as changed
+                if old_name and new_name:
+                    results.append((config, f"binary file changed ({format_size(old_pack.size(old_name))} → "
+                                            f"{format_size(new_pack.size(new_name))})", {}))
+                continue
+            if streaming:
+                # Kept out of the process pool so each big file is only ever read in chunks
+                if old_name and new_name:
+                    streamed += 1
+                    results.append(_streaming_config_diff(config, old_pack, old_name, new_pack, new_name, format_diffs))
+                continue
+            tasks.append((config, old_data, new_data, format_diffs))
+    
+    config_changes = {}
+    noise_hits = {}
+    noise_only = 0
+    results.extend(_run_diff_tasks(tasks, workers))
+    for config, diff, hits in sorted(results, key=lambda result: result[0]):
+        if diff:
+            config_changes[os.path.basename(config)] = diff
+        elif hits:
+            noise_only += 1
+        for rule_name, count in hits.items():
+            noise_hits[rule_name] = noise_hits.get(rule_name, 0) + count
+    if stats is not None:
+        stats.update({"total": total, "skipped": skipped, "diffed": total - skipped,
+                      "binary": binary, "streamed": streamed, "noise_hits": noise_hits, "noise_only": noise_only})
+    print(f"Config comparison: skipped {skipped} of {total} unchanged files (size/CRC/mtime match), "
+          f"{binary} changed binary files compared by size/CRC only"
+          + (f", {streamed} large files diffed by streaming" if streamed else ""))
+    if noise_hits:
+        print("Noise filter: " + ", ".join(f"{rule_name} {count}" for rule_name, count in sorted(noise_hits.items())) +
+              f"; {noise_only} files were only noise")
     return config_changes
 
-def extract_and_compare_datapacks(old_zip, new_zip):
-    old_datapacks = extract_files_from_zip(old_zip, "overrides/config/paxi/datapacks/")
-    new_datapacks = extract_files_from_zip(new_zip, "overrides/config/paxi/datapacks/")
-    added_datapacks = set(new_datapacks.keys()) - set(old_datapacks.keys())
-    removed_datapacks = set(old_datapacks.keys()) - set(new_datapacks.keys())
+def extract_and_compare_datapacks(old_pack, new_pack):
+    old_datapacks = old_pack.datapacks()
+    new_datapacks = new_pack.datapacks()
+    added_datapacks = set(new_datapacks) - set(old_datapacks)
+    removed_datapacks = set(old_datapacks) - set(new_datapacks)
     
     datapack_changes = {}
     if added_datapacks:
@@ -206,63 +1564,169 @@ def extract_and_compare_datapacks(old_zip, new_zip):
     
     return datapack_changes
 
-# Fix the extract_and_compare_custom_mods function
-def extract_and_compare_custom_mods(old_zip, new_zip):
-    # Change "mods/" to "overrides/mods/"
-    old_mods = extract_files_from_zip(old_zip, "overrides/mods/")
-    new_mods = extract_files_from_zip(new_zip, "overrides/mods/")
-    
-    # Filter for only JAR files to avoid processing directories or other files
-    old_mod_files = {path for path in old_mods.keys() if path.lower().endswith('.jar')}
-    new_mod_files = {path for path in new_mods.keys() if path.lower().endswith('.jar')}
+def extract_and_compare_custom_mods(old_pack, new_pack):
+    """Compare overrides/mods jars by index entries only; no jar is decompressed"""
+    # Only JAR files under overrides/mods/ count as custom mods
+    old_mod_files = set(old_pack.custom_jars())
+    new_mod_files = set(new_pack.custom_jars())
     
     added_mods = new_mod_files - old_mod_files
     removed_mods = old_mod_files - new_mod_files
-    return added_mods, removed_mods
-
-def extract_files_from_zip(zip_path, folder):
-    temp_dir = tempfile.mkdtemp()
-    files = {}
-    with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-        for file in zip_ref.namelist():
-            if file.startswith(folder):
-                zip_ref.extract(file, temp_dir)
-                files[file] = os.path.join(temp_dir, file)
-    return files
-
-def generate_changelog(old_zip, new_zip, include_updated_mods=True, include_changed_configs=True, include_added_removed_mods=True, include_datapacks=True, include_options_changes=True):
-    old_manifest = extract_file_from_zip(old_zip, "manifest.json")
-    new_manifest = extract_file_from_zip(new_zip, "manifest.json")
-    old_modlist = extract_file_from_zip(old_zip, "modlist.html")
-    new_modlist = extract_file_from_zip(new_zip, "modlist.html")
-    
-    old_mods = extract_mods_from_manifest(old_manifest) if old_manifest else {}
-    new_mods = extract_mods_from_manifest(new_manifest) if new_manifest else {}
-    old_modlist_set = extract_mods_from_modlist(old_modlist) if old_modlist else set()
-    new_modlist_set = extract_mods_from_modlist(new_modlist) if new_modlist else set()
-    
-    added = new_modlist_set - old_modlist_set
-    removed = old_modlist_set - new_modlist_set
+    # Same path but a different CRC or size means the jar was replaced in place
+    modified_mods = {path for path in old_mod_files & new_mod_files
+                     if not same_member(old_pack, path, new_pack, path)}
+    return added_mods, removed_mods, modified_mods
+
+def _parse_mods_toml(text):
+    """First [[mods]] table of a Forge/NeoForge mods.toml"""
+    if tomllib:
+        try:
+            mods = tomllib.loads(text).get("mods", [])
+            if mods:
+                return mods[0]
+        except tomllib.TOMLDecodeError:
+            pass
+    # Fallback: the [[mods]] block comes before any [[dependencies]], so the
+    # first occurrence of each key belongs to the mod itself
+    mod = {}
+    for key in ("modId", "displayName", "version"):
+        match = re.search(rf'^\s*{key}\s*=\s*"([^"]*)"', text, re.MULTILINE)
+        if match:
+            mod[key] = match.group(1)
+    return mod
+
+def read_jar_metadata(jar_data):
+    """Mod id, display name and version from a jar's loader metadata, read as an in-memory ZIP"""
+    try:
+        with zipfile.ZipFile(io.BytesIO(jar_data)) as jar:
+            names = set(jar.namelist())
+            if "fabric.mod.json" in names:
+                data = json.loads(jar.read("fabric.mod.json").decode("utf-8"), strict=False)
+                return {"id": data.get("id"), "name": data.get("name") or data.get("id"),
+                        "version": str(data.get("version", ""))}
+            if "quilt.mod.json" in names:
+                loader = json.loads(jar.read("quilt.mod.json").decode("utf-8"), strict=False).get("quilt_loader", {})
+                return {"id": loader.get("id"), "name": loader.get("metadata", {}).get("name") or loader.get("id"),
+                        "version": str(loader.get("version", ""))}
+            for toml_name in ("META-INF/mods.toml", "META-INF/neoforge.mods.toml"):
+                if toml_name in names:
+                    mod = _parse_mods_toml(jar.read(toml_name).decode("utf-8", errors="replace"))
+                    version = mod.get("version", "")
+                    # Most Forge mods let Gradle fill the version into the jar manifest
+                    if version == "${file.jarVersion}" and "META-INF/MANIFEST.MF" in names:
+                        manifest = jar.read("META-INF/MANIFEST.MF").decode("utf-8", errors="replace")
+                        match = re.search(r'^Implementation-Version:\s*(\S+)', manifest, re.MULTILINE)
+                        version = match.group(1) if match else version
+                    return {"id": mod.get("modId"), "name": mod.get("displayName") or mod.get("modId"),
+                            "version": version}
+    except (zipfile.BadZipFile, ValueError, KeyError) as e:
+        print(f"Error reading jar metadata: {e}")
+    return None
+
+def resolve_custom_mod_versions(old_pack, new_pack, added_mods, removed_mods, modified_mods):
+    """Turn changed custom jars into "old → new" version updates without any network I/O.
+    
+    Only jars that differ between the packs are opened. Added and removed jars
+    that carry the same mod id are paired up as an update. Returns the remaining
+    added and removed paths plus a sorted list of update dicts.
+    """
+    updates = []
+    for path in modified_mods:
+        old_meta = read_jar_metadata(old_pack.read_bytes(path))
+        new_meta = read_jar_metadata(new_pack.read_bytes(path))
+        updates.append({
+            "file": os.path.basename(path),
+            "name": (new_meta or {}).get("name") or os.path.basename(path),
+            "version": f"{old_meta['version']} → {new_meta['version']}" if old_meta and new_meta else None,
+        })
+    
+    old_by_id = {}
+    for path in removed_mods:
+        meta = read_jar_metadata(old_pack.read_bytes(path))
+        if meta and meta.get("id"):
+            old_by_id[meta["id"]] = (path, meta)
+    
+    added_mods, removed_mods = set(added_mods), set(removed_mods)
+    for path in sorted(added_mods):
+        meta = read_jar_metadata(new_pack.read_bytes(path))
+        if meta and meta.get("id") in old_by_id:
+            old_path, old_meta = old_by_id.pop(meta["id"])
+            added_mods.discard(path)
+            removed_mods.discard(old_path)
+            updates.append({
+                "file": os.path.basename(path),
+                "name": meta.get("name") or meta["id"],
+                "version": f"{old_meta['version']} → {meta['version']}",
+            })
+    
+    updates.sort(key=lambda update: update["name"].lower())
+    return added_mods, removed_mods, updates
+
+def generate_changelog(old_zip, new_zip, include_updated_mods=True, include_changed_configs=True, include_added_removed_mods=True, include_datapacks=True, include_options_changes=True, browser_pool_size=DEFAULT_BROWSER_POOL_SIZE, resolver=None):
+    with open_modpack(old_zip) as old_pack, open_modpack(new_zip) as new_pack:
+        return _generate_changelog_from_packs(old_pack, new_pack, include_updated_mods, include_changed_configs,
+                                              include_added_removed_mods, include_datapacks, include_options_changes,
+                                              browser_pool_size, resolver)
+
+def _generate_changelog_from_packs(old_pack, new_pack, include_updated_mods, include_changed_configs, include_added_removed_mods, include_datapacks, include_options_changes, browser_pool_size, resolver):
     updated = {}
+    remote = None
     
-    new_mod_links = parse_modlist_html(new_modlist)
-    old_mod_links = parse_modlist_html(old_modlist)
+    old_index = old_pack.modrinth_index()
+    new_index = new_pack.modrinth_index()
+    if old_index and new_index:
+        # .mrpack: the index already has every hash and file name
+        new_mod_links, old_mod_links, updated = compare_modrinth_mods(old_index, new_index)
+    else:
+        old_mods = extract_mods_from_manifest(old_pack.manifest_data())
+        new_mods = extract_mods_from_manifest(new_pack.manifest_data())
+        identity = ModIdentityIndex(old_mods, new_mods, old_pack.modlist(), new_pack.modlist(), get_metadata_cache())
+        new_mod_links = identity.links("added")
+        old_mod_links = identity.links("removed")
+        if include_updated_mods:
+            # Lookups run in the background while the archives are compared below
+            plan = ResolutionPlan(old_mods, new_mods, known_projects=identity.known_projects())
+            if resolver is None:
+                resolver = create_resolver(browser_pool_size=browser_pool_size)
+            remote = ThreadPoolExecutor(max_workers=1)
+            updated = remote.submit(resolve_updated_mods, plan, resolver)
+    added = set(new_mod_links)
+    removed = set(old_mod_links)
     
-    if include_updated_mods:
-        with ThreadPoolExecutor() as executor:
-            mod_infos = {project_id: executor.submit(fetch_mod_info_from_cflookup, project_id) for project_id in new_mods}
+    try:
+        details = ""
+        if include_datapacks:
+            datapack_changes = extract_and_compare_datapacks(old_pack, new_pack)
+            if datapack_changes:
+                details += "## Forced Datapacks\n"
+                if "Added" in datapack_changes:
+                    details += "### Added\n" + "\n".join(f"- **{os.path.basename(datapack)}**" for datapack in datapack_changes["Added"]) + "\n\n"
+                if "Removed" in datapack_changes:
+                    details += "### Removed\n" + "\n".join(f"- ~~{os.path.basename(datapack)}~~" for datapack in datapack_changes["Removed"]) + "\n\n"
         
-        browser = PersistentChromeBrowser()
-        try:
-            for project_id, new_file_id in new_mods.items():
-                mod_name, mod_url = mod_infos[project_id].result()
-                old_file_id = old_mods.get(project_id)
-                if old_file_id and old_file_id != new_file_id:
-                    old_version = fetch_mod_version(mod_url, old_file_id, browser)
-                    new_version = fetch_mod_version(mod_url, new_file_id, browser)
-                    updated[mod_name] = f"{old_version} → {new_version}"
-        finally:
-            browser.close()
+        if include_changed_configs:
+            config_changes = extract_and_compare_configs(old_pack, new_pack, workers=os.cpu_count() or 1, format_diffs=True)
+            if config_changes:
+                details += "## Config Changes\n"
+                for config, formatted_diff in config_changes.items():
+                    # Skip this config if there are no actual changes after formatting
+                    if formatted_diff.strip():
+                        details += f"<details>\n<summary><strong>{config}</strong></summary>\n\n```\n"
+                        details += formatted_diff
+                        details += "\n```\n</details>\n\n"
+        
+        if include_options_changes:
+            options_diff = compare_members(old_pack, old_pack.options(), new_pack, new_pack.options())
+            if options_diff.strip():  # Only include changes, not new or removed files
+                details += "## Options Changes\n"
+                details += format_diff(options_diff)
+        
+        # Render stage: wait for the remote lookups only now
+        if isinstance(updated, Future):
+            updated = updated.result()
+    finally:
+        if remote:
+            remote.shutdown(wait=True)
     
     changelog = "# Modpack Changelog\n\n"
     
@@ -273,40 +1737,9 @@ def generate_changelog(old_zip, new_zip, include_updated_mods=True, include_chan
             changelog += "## Removed Mods\n" + "\n".join(f"- ~~[{mod}]({old_mod_links.get(mod, '#')})~~" for mod in removed) + "\n\n"
     
     if include_updated_mods and updated:
-        changelog += "## Updated Mods\n" + "\n".join(f"- **[{name}]({new_mod_links.get(name, '#')})**: {version}" for name, version in updated.items()) + "\n\n"
-    
-    if include_datapacks:
-        datapack_changes = extract_and_compare_datapacks(old_zip, new_zip)
-        if datapack_changes:
-            changelog += "## Forced Datapacks\n"
-            if "Added" in datapack_changes:
-                changelog += "### Added\n" + "\n".join(f"- **{os.path.basename(datapack)}**" for datapack in datapack_changes["Added"]) + "\n\n"
-            if "Removed" in datapack_changes:
-                changelog += "### Removed\n" + "\n".join(f"- ~~{os.path.basename(datapack)}~~" for datapack in datapack_changes["Removed"]) + "\n\n"
-    
-    if include_changed_configs:
-        config_changes = extract_and_compare_configs(old_zip, new_zip)
-        if config_changes:
-            changelog += "## Config Changes\n"
-            for config, diff in config_changes.items():
-                # Only include non-empty changes
-                if diff.strip():
-                    formatted_diff = format_diff_for_display(diff)
-                    # Skip this config if there are no actual changes after formatting
-                    if formatted_diff.strip():
-                        changelog += f"<details>\n<summary><strong>{config}</strong></summary>\n\n```\n"
-                        changelog += formatted_diff
-                        changelog += "\n```\n</details>\n\n"
-    
-    if include_options_changes:
-        old_options = extract_file_from_zip(old_zip, "overrides/options.txt")
-        new_options = extract_file_from_zip(new_zip, "overrides/options.txt")
-        options_diff = compare_files(old_options, new_options)
-        if options_diff.strip():  # Only include changes, not new or removed files
-            changelog += "## Options Changes\n"
-            changelog += format_diff(options_diff)
+        changelog += "## Updated Mods\n" + "\n".join(f"- **[{name}]({info['url'] or '#'})**: {info['version']}" for name, info in updated.items()) + "\n\n"
     
-    return changelog
+    return changelog + details
 
 def format_diff(diff):
     formatted_diff = ""
@@ -323,71 +1756,7 @@ def format_diff(diff):
             formatted_diff += f"  {line}\n"
     return formatted_diff
 
-def format_diff_for_display(diff):
-    """Format diff output to only show changes to existing lines, hiding additions/removals"""
-    formatted_lines = []
-    removed_lines = []
-    added_lines = []
-    
-    # First pass: collect all added and removed lines
-    for line in diff.splitlines():
-        if line.startswith('---') or line.startswith('+++') or line.startswith('@@') or line.startswith(' '):
-            continue
-            
-        # Skip timestamp lines
-        if line.startswith('-') or line.startswith('+'):
-            content = line[1:].strip()
-            if (content.startswith('#') and 
-                (any(tz in content for tz in ["CET", "UTC", "GMT", "EST", "PST", "PDT", "EDT"]) or
-                 any(month in content for month in ["Jan", "Feb", "Mar", "Apr", "May", "Jun", 
-                      "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]))):
-                continue
-        
-        if line.startswith('-'):
-            removed_lines.append(line[1:])
-        elif line.startswith('+'):
-            added_lines.append(line[1:])
-    
-    # Second pass: only include pairs of lines that are similar (actual changes)
-    i, j = 0, 0
-    while i < len(removed_lines) and j < len(added_lines):
-        removed = removed_lines[i]
-        added = added_lines[j]
-        
-        # Are these lines similar? (likely a change rather than insert/delete)
-        if similarity_score(removed, added) > 0.5:  # Threshold for considering it a change
-            formatted_lines.append(f"Changed: {removed}")
-            formatted_lines.append(f"Changed to: {added}")
-            i += 1
-            j += 1
-        else:
-            # Not similar enough, so advance both counters to look for better matches
-            # This skips pure additions/removals as requested
-            i += 1
-            j += 1
-    
-    # Don't include any remaining lines since they're pure additions/removals
-    
-    return '\n'.join(formatted_lines)
-
-# Helper function to assess similarity between two strings
-def similarity_score(str1, str2):
-    """Calculate a similarity score between 0 and 1"""
-    # Simple implementation - can be improved
-    if '=' in str1 and '=' in str2:
-        # For config lines with key=value format, compare the keys
-        key1 = str1.split('=')[0].strip()
-        key2 = str2.split('=')[0].strip()
-        return 1.0 if key1 == key2 else 0.0
-    
-    # For other formats, use string similarity
-    try:
-        import difflib
-        return difflib.SequenceMatcher(None, str1, str2).ratio()
-    except:
-        # Fallback if difflib not available
-        common = set(str1) & set(str2)
-        return len(common) / max(len(set(str1)), len(set(str2)))
+MODPACK_FILE_TYPES = [("Modpacks", "*.zip *.mrpack"), ("CurseForge ZIP files", "*.zip"), ("Modrinth packs", "*.mrpack")]
 
 class ModpackChangelogApp:
     def __init__(self, root):
@@ -401,13 +1770,15 @@ class ModpackChangelogApp:
         frame = tk.Frame(self.root)
         frame.pack(pady=10)
         
-        tk.Label(frame, text="Old Modpack (ZIP):").grid(row=0, column=0, padx=5, pady=5)
+        tk.Label(frame, text="Old Modpack (ZIP or folder):").grid(row=0, column=0, padx=5, pady=5)
         tk.Entry(frame, textvariable=self.old_folder, width=50).grid(row=0, column=1, padx=5, pady=5)
         tk.Button(frame, text="Browse", command=self.select_old_folder).grid(row=0, column=2, padx=5, pady=5)
+        tk.Button(frame, text="Folder", command=self.select_old_instance_folder).grid(row=0, column=4, padx=5, pady=5)
         
-        tk.Label(frame, text="New Modpack (ZIP):").grid(row=1, column=0, padx=5, pady=5)
+        tk.Label(frame, text="New Modpack (ZIP or folder):").grid(row=1, column=0, padx=5, pady=5)
         tk.Entry(frame, textvariable=self.new_folder, width=50).grid(row=1, column=1, padx=5, pady=5)
         tk.Button(frame, text="Browse", command=self.select_new_folder).grid(row=1, column=2, padx=5, pady=5)
+        tk.Button(frame, text="Folder", command=self.select_new_instance_folder).grid(row=1, column=4, padx=5, pady=5)
         
         # Create dropdown menu for settings
         settings_frame = tk.LabelFrame(self.root, text="Changelog Settings")
@@ -421,6 +1792,13 @@ class ModpackChangelogApp:
         self.include_options_changes = tk.BooleanVar(value=True)
         self.include_custom_mods = tk.BooleanVar(value=True)
         self.use_div_spoilers = tk.BooleanVar(value=True)
+        self.config_workers = tk.IntVar(value=os.cpu_count() or 1)
+        self.browser_pool_size = tk.IntVar(value=DEFAULT_BROWSER_POOL_SIZE)
+        self.curseforge_api_key = tk.StringVar(value=os.environ.get("CURSEFORGE_API_KEY", ""))
+        
+        # Browsers stay warm between runs; quit them when the window closes
+        self.browser_service = BrowserService()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
 
         # Create dropdown button
         self.dropdown_button = tk.Button(settings_frame, text="Sections to Include ▼", 
@@ -446,6 +1824,24 @@ class ModpackChangelogApp:
         tk.Checkbutton(self.dropdown_menu, text="Custom Mods (overrides/mods folder)", 
                     variable=self.include_custom_mods).pack(anchor="w", padx=5, pady=2)
         
+        # Worker processes used for diffing changed configs (1 = no process pool)
+        workers_frame = tk.Frame(self.dropdown_menu)
+        workers_frame.pack(anchor="w", padx=5, pady=2)
+        tk.Label(workers_frame, text="Config diff workers:").pack(side=tk.LEFT)
+        tk.Spinbox(workers_frame, from_=1, to=64, width=4,
+                   textvariable=self.config_workers).pack(side=tk.LEFT, padx=5)
+        
+        # Headless browsers used in parallel for mod version lookups
+        tk.Label(workers_frame, text="Browsers:").pack(side=tk.LEFT, padx=(10, 0))
+        tk.Spinbox(workers_frame, from_=1, to=16, width=4,
+                   textvariable=self.browser_pool_size).pack(side=tk.LEFT, padx=5)
+        
+        # With an API key, versions are resolved in batched API calls instead of scraping
+        api_frame = tk.Frame(self.dropdown_menu)
+        api_frame.pack(anchor="w", padx=5, pady=2)
+        tk.Label(api_frame, text="CurseForge API key (optional):").pack(side=tk.LEFT)
+        tk.Entry(api_frame, textvariable=self.curseforge_api_key, width=40, show="*").pack(side=tk.LEFT, padx=5)
+        
         # Add this to the ModpackChangelogApp.__init__ method after the Generate and Save buttons
 
         # Create button frame with Generate, Stop, and Save buttons
@@ -557,32 +1953,46 @@ class ModpackChangelogApp:
         except Exception as e:
             print(f"Error saving history: {e}")
 
+    def on_close(self):
+        self.browser_service.close()
+        self.root.destroy()
+
+    def _remember_path(self, side, path):
+        """Show a picked pack on the "old"/"new" side and move it to the top of its history"""
+        (self.old_folder if side == "old" else self.new_folder).set(path)
+        if path in self.recent_files[side]:
+            self.recent_files[side].remove(path)
+        self.recent_files[side].insert(0, path)
+        self.save_recent_files()
+    
     def select_old_folder(self):
-        path = filedialog.askopenfilename(filetypes=[("ZIP files", "*.zip")])
+        path = filedialog.askopenfilename(filetypes=MODPACK_FILE_TYPES)
         if path:
-            self.old_folder.set(path)
-            # Update history
-            if path in self.recent_files["old"]:
-                self.recent_files["old"].remove(path)
-            self.recent_files["old"].insert(0, path)
-            self.save_recent_files()
+            self._remember_path("old", path)
     
     def select_new_folder(self):
-        path = filedialog.askopenfilename(filetypes=[("ZIP files", "*.zip")])
+        path = filedialog.askopenfilename(filetypes=MODPACK_FILE_TYPES)
+        if path:
+            self._remember_path("new", path)
+    
+    def select_old_instance_folder(self):
+        """Pick an unpacked export or game instance folder instead of a ZIP"""
+        path = filedialog.askdirectory()
+        if path:
+            self._remember_path("old", path)
+    
+    def select_new_instance_folder(self):
+        """Pick an unpacked export or game instance folder instead of a ZIP"""
+        path = filedialog.askdirectory()
         if path:
-            self.new_folder.set(path)
-            # Update history
-            if path in self.recent_files["new"]:
-                self.recent_files["new"].remove(path)
-            self.recent_files["new"].insert(0, path)
-            self.save_recent_files()
+            self._remember_path("new", path)
     
     def generate_changelog(self):
         old_path = self.old_folder.get()
         new_path = self.new_folder.get()
         
         if not old_path or not new_path:
-            messagebox.showerror("Error", "Please select both old and new modpack zip files")
+            messagebox.showerror("Error", "Please select both old and new modpacks (ZIP files or folders)")
             return
         
         # Reset UI state
@@ -601,10 +2011,12 @@ class ModpackChangelogApp:
                         daemon=True).start()
     
     def _run_changelog_generation(self, old_path, new_path):
+        old_pack = new_pack = None
+        remote = None
         try:
-            # Extract manifest files to get mod counts
-            old_manifest = extract_file_from_zip(old_path, "manifest.json")
-            new_manifest = extract_file_from_zip(new_path, "manifest.json")
+            # Open each modpack once; every later stage reads from these handles
+            old_pack = open_modpack(old_path)
+            new_pack = open_modpack(new_path)
             
             if self.is_cancelled:
                 self._handle_generation_end()
@@ -613,69 +2025,56 @@ class ModpackChangelogApp:
             self.root.after(0, lambda: self.status_label.config(text="Loading mod information..."))
             
             # Load mod data
-            old_mods = extract_mods_from_manifest(old_manifest) if old_manifest else {}
-            new_mods = extract_mods_from_manifest(new_manifest) if new_manifest else {}
+            old_mods = extract_mods_from_manifest(old_pack.manifest_data())
+            new_mods = extract_mods_from_manifest(new_pack.manifest_data())
             
             # Initialize empty updated_mods
             updated_mods = {}
+            identity = None
+            
+            old_index = old_pack.modrinth_index()
+            new_index = new_pack.modrinth_index()
+            if old_index and new_index:
+                # .mrpack: versions come straight from the index, no scraping needed
+                if self.include_updated_mods.get():
+                    updated_mods = compare_modrinth_mods(old_index, new_index)[2]
+            else:
+                # Names every mod modlist.html identifies; built once and reused for added/removed mods
+                identity = ModIdentityIndex(old_mods, new_mods, old_pack.modlist(), new_pack.modlist(),
+                                            get_metadata_cache())
             
             # Only fetch mod updates if the option is enabled and not cancelled
-            if self.include_updated_mods.get() and not self.is_cancelled:
-                # Setup for tracking updated mods
-                updated_mods_count = 0
-                potential_updated_mods = 0
-                
-                for project_id, new_file_id in new_mods.items():
-                    old_file_id = old_mods.get(project_id)
-                    if old_file_id and old_file_id != new_file_id:
-                        potential_updated_mods += 1
+            if identity and self.include_updated_mods.get() and not self.is_cancelled:
+                # Work out the delta first so only updated mods get looked up
+                plan = ResolutionPlan(old_mods, new_mods, known_projects=identity.known_projects())
                 
                 # Only proceed if we have mods to update
-                if potential_updated_mods > 0:
-                    browser = PersistentChromeBrowser()
+                if plan.updated:
+                    resolver = create_resolver(self.curseforge_api_key.get().strip(), self.browser_pool_size.get(),
+                                               self.browser_service)
                     
-                    try:
-                        # Fetch mod info concurrently
-                        with ThreadPoolExecutor() as executor:
-                            mod_infos = {project_id: executor.submit(fetch_mod_info_from_cflookup, project_id) 
-                                        for project_id in new_mods}
-                        
-                        # Process each mod with progress updates
-                        for project_id, new_file_id in new_mods.items():
-                            if self.is_cancelled:
-                                break
-                            old_file_id = old_mods.get(project_id)
-                            
-                            if old_file_id and old_file_id != new_file_id:
-                                # Update status
-                                mod_name, mod_url = mod_infos[project_id].result()
-                                self.root.after(0, lambda text=f"Fetching: {mod_name}": 
-                                    self.status_label.config(text=text))
-                                
-                                # Fetch versions
-                                old_version = fetch_mod_version(mod_url, old_file_id, browser)
-                                new_version = fetch_mod_version(mod_url, new_file_id, browser)
-                                
-                                # Store both version info and URL
-                                updated_mods[mod_name] = {
-                                    "version": f"{old_version} → {new_version}",
-                                    "url": mod_url
-                                }
-                                
-                                # Update progress
-                                updated_mods_count += 1
-                                progress = (updated_mods_count / potential_updated_mods) * 100
-                                self.root.after(0, lambda p=progress: self._update_progress(p))
-                        
-                    finally:
-                        browser.close()
+                    def on_progress(done, total, project_id):
+                        # Update progress
+                        progress = (done / total) * 100
+                        self.root.after(0, lambda p=progress: self._update_progress(p))
+                        status = f"Fetched {done} of {total} mod versions"
+                        if project_id:
+                            status += f": {resolver.mod_name(project_id)}"
+                        self.root.after(0, lambda text=status: self.status_label.config(text=text))
+                    
+                    # The resolver works through every changed file (in parallel or batched) in
+                    # the background while the archives are analysed below
+                    remote = ThreadPoolExecutor(max_workers=1)
+                    updated_mods = remote.submit(resolve_updated_mods, plan, resolver, on_progress,
+                                                 lambda: self.is_cancelled)
             
             # Only generate changelog if not cancelled
             if not self.is_cancelled:
                 # Generate the changelog
                 self.root.after(0, lambda: self.status_label.config(text="Generating changelog..."))
-                self.changelog = self._generate_full_changelog(old_path, new_path, updated_mods)
-                
+                self.changelog = self._generate_full_changelog(old_pack, new_pack, updated_mods, identity)
+            
+            if not self.is_cancelled:
                 # Update UI with result
                 self.root.after(0, lambda: self._update_ui_with_changelog())
             else:
@@ -685,6 +2084,13 @@ class ModpackChangelogApp:
             self.root.after(0, lambda: messagebox.showerror("Error", f"An error occurred: {str(e)}"))
             self.root.after(0, lambda: self.status_label.config(text="Error occurred"))
             self.root.after(0, lambda: self._handle_generation_end())
+        finally:
+            if remote:
+                # Never close the packs under a lookup that is still running
+                remote.shutdown(wait=True)
+            for pack in (old_pack, new_pack):
+                if pack:
+                    pack.close()
     
     def _update_progress(self, value):
         self.progress_bar["value"] = value
@@ -703,24 +2109,27 @@ class ModpackChangelogApp:
         self.progress_bar["value"] = 100
         self._handle_generation_end()  # Reset buttons
     
-    def _generate_full_changelog(self, old_zip, new_zip, updated_mods):
-        # Extract all the non-mod version parts of the changelog generation
-        
-        old_manifest = extract_file_from_zip(old_zip, "manifest.json")
-        new_manifest = extract_file_from_zip(new_zip, "manifest.json")
-        old_modlist = extract_file_from_zip(old_zip, "modlist.html")
-        new_modlist = extract_file_from_zip(new_zip, "modlist.html")
-        
-        old_modlist_set = extract_mods_from_modlist(old_modlist) if old_modlist else set()
-        new_modlist_set = extract_mods_from_modlist(new_modlist) if new_modlist else set()
-        
-        added = new_modlist_set - old_modlist_set
-        removed = old_modlist_set - new_modlist_set
-        
-        new_mod_links = parse_modlist_html(new_modlist)
-        old_mod_links = parse_modlist_html(old_modlist)
-        
-        old_ver, new_ver = self._detect_versions(old_zip, new_zip)
+    def _generate_full_changelog(self, old_pack, new_pack, updated_mods, identity=None):
+        # Extract all the non-mod version parts of the changelog generation. updated_mods may be a
+        # Future from the remote stage; it is only waited on once the local sections are done.
+        # identity is the ModIdentityIndex already built for the packs, if any
+        
+        old_index = old_pack.modrinth_index()
+        new_index = new_pack.modrinth_index()
+        if old_index and new_index:
+            new_mod_links, old_mod_links, _ = compare_modrinth_mods(old_index, new_index)
+        else:
+            if identity is None:
+                old_mods = extract_mods_from_manifest(old_pack.manifest_data())
+                new_mods = extract_mods_from_manifest(new_pack.manifest_data())
+                identity = ModIdentityIndex(old_mods, new_mods, old_pack.modlist(), new_pack.modlist(),
+                                            get_metadata_cache())
+            new_mod_links = identity.links("added")
+            old_mod_links = identity.links("removed")
+        added = set(new_mod_links)
+        removed = set(old_mod_links)
+        
+        old_ver, new_ver = self._detect_versions(old_pack, new_pack)
         changelog = f"# Modpack Changelog: {old_ver} → {new_ver}\n\n"
         
         if self.include_added_removed_mods.get():
@@ -738,67 +2147,86 @@ class ModpackChangelogApp:
                     changelog += f"- ~~[{mod}]({old_mod_links.get(mod, '#')})~~\n"
                 changelog += "\n"
         
-        if self.include_updated_mods.get() and updated_mods:
-            changelog += "## Updated Mods\n" + "\n".join(
-                f"- **[{name}]({info['url'] or '#'})**: {info['version']}" 
-                for name, info in updated_mods.items()
-            ) + "\n\n"
-        
+        details = ""
         if self.include_custom_mods.get():
             # Check for custom mods in overrides/mods folder
-            added_custom_mods, removed_custom_mods = extract_and_compare_custom_mods(old_zip, new_zip)
+            added_custom_mods, removed_custom_mods, modified_custom_mods = extract_and_compare_custom_mods(old_pack, new_pack)
+            added_custom_mods, removed_custom_mods, updated_custom_mods = resolve_custom_mod_versions(
+                old_pack, new_pack, added_custom_mods, removed_custom_mods, modified_custom_mods)
             
-            if added_custom_mods or removed_custom_mods:
-                changelog += "## Custom Mods Changes (overrides/mods folder)\n"
+            if added_custom_mods or removed_custom_mods or updated_custom_mods:
+                details += "## Custom Mods Changes (overrides/mods folder)\n"
                 
                 if added_custom_mods:
-                    changelog += "### Added Custom Mods\n"
+                    details += "### Added Custom Mods\n"
                     for mod in sorted(added_custom_mods):
                         mod_name = os.path.basename(mod)
-                        changelog += f"- **{mod_name}**\n"
-                    changelog += "\n"
+                        details += f"- **{mod_name}**\n"
+                    details += "\n"
                 
                 if removed_custom_mods:
-                    changelog += "### Removed Custom Mods\n"
+                    details += "### Removed Custom Mods\n"
                     for mod in sorted(removed_custom_mods):
                         mod_name = os.path.basename(mod)
-                        changelog += f"- ~~{mod_name}~~\n"
-                    changelog += "\n"
+                        details += f"- ~~{mod_name}~~\n"
+                    details += "\n"
+                
+                if updated_custom_mods:
+                    details += "### Updated Custom Mods\n"
+                    for mod in updated_custom_mods:
+                        if mod["version"]:
+                            details += f"- **{mod['name']}** ({mod['file']}): {mod['version']}\n"
+                        else:
+                            details += f"- *{mod['file']}* (contents changed)\n"
+                    details += "\n"
         
         if self.include_datapacks.get():
-            datapack_changes = extract_and_compare_datapacks(old_zip, new_zip)
+            datapack_changes = extract_and_compare_datapacks(old_pack, new_pack)
             if datapack_changes:
-                changelog += "## Forced Datapacks\n"
+                details += "## Forced Datapacks\n"
                 if "Added" in datapack_changes:
-                    changelog += "### Added\n" + "\n".join(f"- **{os.path.basename(datapack)}**" for datapack in datapack_changes["Added"]) + "\n\n"
+                    details += "### Added\n" + "\n".join(f"- **{os.path.basename(datapack)}**" for datapack in datapack_changes["Added"]) + "\n\n"
                 if "Removed" in datapack_changes:
-                    changelog += "### Removed\n" + "\n".join(f"- ~~{os.path.basename(datapack)}~~" for datapack in datapack_changes["Removed"]) + "\n\n"
+                    details += "### Removed\n" + "\n".join(f"- ~~{os.path.basename(datapack)}~~" for datapack in datapack_changes["Removed"]) + "\n\n"
         
         if self.include_changed_configs.get():
-            config_changes = extract_and_compare_configs(old_zip, new_zip)
+            config_stats = {}
+            config_changes = extract_and_compare_configs(old_pack, new_pack, config_stats,
+                                                         workers=self.config_workers.get(), format_diffs=True)
+            self.root.after(0, lambda text=f"Configs: {config_stats['skipped']} of {config_stats['total']} unchanged, "
+                                           f"{config_stats['diffed']} diffed":
+                self.status_label.config(text=text))
             if config_changes:
-                changelog += "## Config Changes\n"
-                for config, diff in config_changes.items():
-                    # Only include non-empty changes
-                    if diff.strip():
-                        formatted_diff = format_diff_for_display(diff)
-                        # Skip this config if there are no actual changes after formatting
-                        if formatted_diff.strip():
-                            changelog += f"<details>\n<summary><strong>{config}</strong></summary>\n\n```\n"
-                            changelog += formatted_diff
-                            changelog += "\n```\n</details>\n\n"
+                details += "## Config Changes\n"
+                for config, formatted_diff in config_changes.items():
+                    # Skip this config if there are no actual changes after formatting
+                    if formatted_diff.strip():
+                        details += f"<details>\n<summary><strong>{config}</strong></summary>\n\n```\n"
+                        details += formatted_diff
+                        details += "\n```\n</details>\n\n"
         
         if self.include_options_changes.get():
-            old_options = extract_file_from_zip(old_zip, "overrides/options.txt")
-            new_options = extract_file_from_zip(new_zip, "overrides/options.txt")
-            options_diff = compare_files(old_options, new_options)
+            old_options, new_options = old_pack.options(), new_pack.options()
+            options_diff = display_diff("options.txt", old_pack.read_lines(old_options) if old_options else [],
+                                        new_pack.read_lines(new_options) if new_options else [])
             if options_diff.strip():  # Only include changes, not new or removed files
-                changelog += "## Options Changes\n"
-                changelog += "<details>\n<summary><strong>Click to expand options.txt changes</strong></summary>\n\n```\n"
-                changelog += format_diff_for_display(options_diff)  # Use the new function here
-                changelog += "\n```\n</details>\n\n"
+                details += "## Options Changes\n"
+                details += "<details>\n<summary><strong>Click to expand options.txt changes</strong></summary>\n\n```\n"
+                details += options_diff
+                details += "\n```\n</details>\n\n"
+        
+        # Render stage: the remote lookups are only needed from here on
+        if isinstance(updated_mods, Future):
+            self.root.after(0, lambda: self.status_label.config(text="Waiting for mod lookups..."))
+            updated_mods = updated_mods.result()
+        
+        if self.include_updated_mods.get() and updated_mods:
+            changelog += "## Updated Mods\n" + "\n".join(
+                f"- **[{name}]({info['url'] or '#'})**: {info['version']}" 
+                for name, info in updated_mods.items()
+            ) + "\n\n"
         
-        return changelog
+        return changelog + details
     
     def save_changelog(self):
         file_types = [
@@ -1002,14 +2430,14 @@ class ModpackChangelogApp:
         else:
             self.text_area.insert(tk.END, f"No {selection} section found in the changelog.")
     
-    def _detect_versions(self, old_path, new_path):
+    def _detect_versions(self, old_pack, new_pack):
         """Attempt to detect modpack versions from filenames or manifest data"""
         old_ver = "Old Version"
         new_ver = "New Version"
         
         # Try from filenames first
-        old_basename = os.path.basename(old_path).replace('.zip', '')
-        new_basename = os.path.basename(new_path).replace('.zip', '')
+        old_basename = os.path.basename(old_pack.path).replace('.zip', '')
+        new_basename = os.path.basename(new_pack.path).replace('.zip', '')
         
         # Look for version patterns in filenames (like v1.2.3, 1.2.3, etc.)
         version_pattern = r'[-_]?v?(\d+\.\d+(?:\.\d+)?(?:[a-z]?(?:\d+)?)?)'
@@ -1022,28 +2450,26 @@ class ModpackChangelogApp:
         if new_match:
             new_ver = new_match.group(1)
         
-        # Try from manifest.json if available
+        # Try from manifest.json if available (already parsed by the archive)
         try:
-            old_manifest_path = extract_file_from_zip(old_path, "manifest.json")
-            if old_manifest_path:
-                with open(old_manifest_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    if "version" in data:
-                        old_ver = data["version"]
-                    elif "minecraft" in data and "version" in data["minecraft"]:
-                        old_ver = f"MC-{data['minecraft']['version']}"
+            data = old_pack.manifest_data() or old_pack.modrinth_index() or {}
+            if "version" in data:
+                old_ver = data["version"]
+            elif "versionId" in data:
+                old_ver = data["versionId"]
+            elif "minecraft" in data and "version" in data["minecraft"]:
+                old_ver = f"MC-{data['minecraft']['version']}"
         except:
             pass  # Use already detected version
         
         try:
-            new_manifest_path = extract_file_from_zip(new_path, "manifest.json")
-            if new_manifest_path:
-                with open(new_manifest_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    if "version" in data:
-                        new_ver = data["version"]
-                    elif "minecraft" in data and "version" in data["minecraft"]:
-                        new_ver = f"MC-{data['minecraft']['version']}"
+            data = new_pack.manifest_data() or new_pack.modrinth_index() or {}
+            if "version" in data:
+                new_ver = data["version"]
+            elif "versionId" in data:
+                new_ver = data["versionId"]
+            elif "minecraft" in data and "version" in data["minecraft"]:
+                new_ver = f"MC-{data['minecraft']['version']}"
         except:
             pass  # Use already detected version
         
@@ -1066,4 +2492,4 @@ class ModpackChangelogApp:
 if __name__ == "__main__":
     root = tk.Tk()
     app = ModpackChangelogApp(root)
-    root.mainloop()
\ No newline at end of file
+    root.mainloop()